@@ -11,7 +11,16 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import altair as alt
 import os
+import glob
+import hashlib
 import locale
+import logging
+import re
+import shutil
+import sqlite3
+import string
+import threading
+import time
 from functools import partial
 
 # -----------------------------------------------------------------------------
@@ -29,6 +38,8 @@ st.set_page_config(
 # Taux de conversion EUR vers FCFA
 TAUX_EUR_FCFA = 655.957
 
+journal = logging.getLogger(__name__)
+
 # -----------------------------------------------------------------------------
 # GESTION DES LANGUES ET TRADUCTIONS
 # -----------------------------------------------------------------------------
@@ -118,6 +129,15 @@ translations = {
         "currency": "Devise",
         "compact_mode": "Mode Compact",
         "enable_compact": "Activer le mode résumé compact",
+        "show_more": "Afficher {nombre} de plus",
+        
+        # Tableaux détaillés
+        "columns": "Colonnes",
+        "sort_by": "Trier par",
+        "no_sort": "Aucun tri",
+        "descending": "Décroissant",
+        "page": "Page",
+        "rows_shown": "Lignes {debut} à {fin} sur {total}",
         
         # Thèmes
         "dark_gold": "Noir & Or",
@@ -231,6 +251,15 @@ translations = {
         "currency": "Currency",
         "compact_mode": "Compact Mode",
         "enable_compact": "Enable compact summary mode",
+        "show_more": "Show {nombre} more",
+        
+        # Detailed tables
+        "columns": "Columns",
+        "sort_by": "Sort by",
+        "no_sort": "No sorting",
+        "descending": "Descending",
+        "page": "Page",
+        "rows_shown": "Rows {debut} to {fin} of {total}",
         
         # Themes
         "dark_gold": "Dark & Gold",
@@ -364,10 +393,46 @@ if 'currency' not in st.session_state:
 if 'compact_mode' not in st.session_state:
     st.session_state.compact_mode = False  # Mode compact désactivé par défaut
 
+# Devise de la session, lue une fois par exécution (changer de devise relance le script)
+devise_session = st.session_state.currency
+
+# Traductions de la langue de la session, résolues une fois par exécution (changer de langue relance le script)
+traductions_session = translations[st.session_state.language]
+
 # Fonction de traduction pour faciliter l'accès aux textes traduits
 def t(key):
     """Récupère la traduction d'une clé dans la langue actuelle"""
-    return translations[st.session_state.language].get(key, key)
+    return traductions_session.get(key, key)
+
+@st.cache_resource
+def libelles_par_langue():
+    """
+    Construit une fois, pour chaque langue, la table des libellés indexée par clé de traduction
+    
+    Returns:
+        dict: Langue -> Series clé de traduction -> libellé
+    """
+    return {langue: pd.Series(libelles) for langue, libelles in translations.items()}
+
+def traduire(serie):
+    """
+    Traduit à l'affichage une colonne de clés de traduction (départements, traitements, résultats, rôles)
+    
+    Les données restent indépendantes de la langue. Pour une colonne
+    Categorical, seules les catégories sont traduites et les codes des
+    lignes sont réutilisés tels quels.
+    
+    Args:
+        serie: Series de clés de traduction
+    
+    Returns:
+        Series: Les libellés dans la langue de la session (clé inchangée si elle n'a pas de traduction)
+    """
+    libelles = libelles_par_langue()[st.session_state.language]
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        categories = serie.cat.categories
+        return serie.cat.rename_categories(libelles.reindex(categories).fillna(pd.Series(categories, index=categories)).to_numpy())
+    return serie.map(libelles).fillna(serie)
 
 # Fonction pour formater les montants selon la devise choisie
 def format_currency(amount, currency=None):
@@ -382,7 +447,7 @@ def format_currency(amount, currency=None):
         Le montant formaté avec le symbole de devise approprié
     """
     if currency is None:
-        currency = st.session_state.currency
+        currency = devise_session
     
     if currency == "fcfa":
         # Convertir de EUR à FCFA si nécessaire et formater
@@ -392,26 +457,115 @@ def format_currency(amount, currency=None):
         # Format EUR
         return f"{amount:,.0f} €".replace(",", " ")
 
+# Symbole ajouté après le montant, par devise
+SYMBOLES_DEVISES = {"fcfa": " FCFA", "eur": " €"}
+# Caractère de chaque chiffre décimal
+CHIFFRES = np.array(list('0123456789'))
+
+def format_currency_array(amounts, currency=None):
+    """
+    Formate d'un bloc un tableau de montants selon la devise choisie
+    
+    Même rendu que format_currency, mais l'arrondi, l'écriture des chiffres et
+    le groupement des milliers sont faits par NumPy sur tout le tableau plutôt
+    que montant par montant. Les valeurs manquantes ou infinies sont laissées vides.
+    
+    Args:
+        amounts: Series, tableau ou liste de montants en euros (une dimension)
+        currency: La devise à utiliser (si None, utilise la devise de session)
+    
+    Returns:
+        Les montants formatés (Series de même index si amounts est une Series,
+        tableau NumPy sinon)
+    """
+    if currency is None:
+        currency = devise_session
+    
+    montants = np.asarray(amounts, dtype=np.float64).ravel()
+    valeurs = montants * TAUX_EUR_FCFA if currency == "fcfa" else montants
+    
+    # Les montants hors de la plage des entiers 64 bits sont écrits par format_currency
+    arrondis = np.rint(valeurs)
+    finies = np.isfinite(arrondis)
+    entiers_valides = finies & (np.abs(arrondis) < 1e18)
+    arrondis = np.where(entiers_valides, arrondis, 0)
+    
+    # Par blocs, pour borner la taille des matrices de caractères
+    symbole = SYMBOLES_DEVISES[currency]
+    blocs = [ecrire_montants(arrondis[debut:debut + TAILLE_BLOC], symbole) for debut in range(0, arrondis.size, TAILLE_BLOC)]
+    resultat = np.concatenate(blocs) if blocs else np.empty(0, dtype=str)
+    
+    resultat[~finies] = ''
+    hors_plage = np.flatnonzero(finies & ~entiers_valides)
+    if hors_plage.size:
+        resultat = resultat.astype(object)
+        for position in hors_plage:
+            resultat[position] = format_currency(montants[position], currency)
+    
+    if isinstance(amounts, pd.Series):
+        return pd.Series(resultat, index=amounts.index, name=amounts.name)
+    return resultat
+
+def ecrire_montants(arrondis, symbole):
+    """
+    Écrit des montants entiers (en flottants), milliers séparés par des espaces
+    
+    Chaque montant est une ligne d'une matrice de caractères : chiffres alignés
+    à droite par groupes de trois, chaque groupe précédé d'une espace, puis le
+    symbole. Les lignes sont ensuite décalées vers la gauche jusqu'à leur signe
+    ou leur premier chiffre, et lues comme un tableau de chaînes NumPy.
+    """
+    entiers = np.abs(arrondis).astype(np.int64)
+    n = len(entiers)
+    
+    nombre_groupes = -(-len(str(entiers.max())) // 3) if n else 1
+    puissances = 10 ** np.arange(3 * nombre_groupes - 1, -1, -1, dtype=np.int64)
+    chiffres = CHIFFRES[entiers[:, None] // puissances % 10]
+    chiffres[(entiers[:, None] < puissances) & (puissances > 1)] = ' '
+    groupes = np.full((n, nombre_groupes, 4), ' ', dtype='U1')
+    groupes[:, :, 1:] = chiffres.reshape(n, nombre_groupes, 3)
+    suffixe = np.broadcast_to(np.array(list(symbole)), (n, len(symbole)))
+    lignes = np.concatenate([groupes.reshape(n, 4 * nombre_groupes), suffixe], axis=1)
+    
+    # Le signe précède le premier chiffre ; la fin des lignes décalées est complétée
+    # par des caractères nuls, que NumPy ignore en fin de chaîne. Les montants de même
+    # longueur sont décalés ensemble.
+    negatifs = np.signbit(arrondis)
+    debut = (lignes != ' ').argmax(axis=1) - negatifs
+    lignes[negatifs, debut[negatifs]] = '-'
+    largeur = lignes.shape[1]
+    caracteres = np.full((n, largeur), '', dtype='U1')
+    for colonne in np.unique(debut):
+        selection = debut == colonne
+        caracteres[selection, :largeur - colonne] = lignes[selection, colonne:]
+    return caracteres.view(f'U{largeur}').ravel()
+
 # -----------------------------------------------------------------------------
-# GÉNÉRATION DES STYLES CSS BASÉS SUR LE THÈME ACTUEL
+# GÉNÉRATION DES STYLES CSS PAR THÈME
 # -----------------------------------------------------------------------------
 
 # Récupération du thème actuel
 current_theme = themes[st.session_state.theme]
 
-# Génération du CSS personnalisé basé sur le thème actuel
-custom_css = f"""
+def construire_css(theme):
+    """
+    Génère la feuille de style personnalisée d'un thème
+    
+    Les commentaires et les espaces superflus sont retirés pour alléger le
+    message envoyé au navigateur.
+    """
+    css = f"""
 <style>
     /* Styles globaux */
     .stApp {{
-        background-color: {current_theme["bg_color"]};
-        color: {current_theme["text_color"]};
+        background-color: {theme["bg_color"]};
+        color: {theme["text_color"]};
     }}
     
     .main-header {{
         font-size: 2.5rem;
         font-weight: 700;
-        color: {current_theme["primary_color"]};
+        color: {theme["primary_color"]};
         margin-bottom: 1.5rem;
         text-align: center;
         text-shadow: 0px 2px 3px rgba(0,0,0,0.3);
@@ -421,21 +575,21 @@ custom_css = f"""
     .sub-header {{
         font-size: 1.5rem;
         font-weight: 600;
-        color: {current_theme["secondary_color"]};
+        color: {theme["secondary_color"]};
         margin-bottom: 1.5rem;
-        border-bottom: 2px solid {current_theme["primary_color"]};
+        border-bottom: 2px solid {theme["primary_color"]};
         padding-bottom: 0.5rem;
         letter-spacing: 0.5px;
     }}
     
     /* Cartes métriques */
     .metric-card {{
-        background-color: {current_theme["card_bg"]};
+        background-color: {theme["card_bg"]};
         border-radius: 0.5rem;
         padding: 1.5rem;
         box-shadow: 0 4px 6px rgba(0, 0, 0, 0.3);
         margin-bottom: 1.5rem;
-        border-top: 3px solid {current_theme["primary_color"]};
+        border-top: 3px solid {theme["primary_color"]};
         transition: transform 0.3s ease, box-shadow 0.3s ease;
     }}
     
@@ -447,46 +601,59 @@ custom_css = f"""
     .metric-value {{
         font-size: 2rem;
         font-weight: 700;
-        color: {current_theme["primary_color"]};
+        color: {theme["primary_color"]};
         text-shadow: 0px 1px 2px rgba(0,0,0,0.2);
     }}
     
     .metric-label {{
         font-size: 0.9rem;
-        color: {current_theme["text_muted"]};
+        color: {theme["text_muted"]};
         font-weight: 500;
         letter-spacing: 0.5px;
     }}
     
     .positive-change {{
-        color: {current_theme["success_color"]};
+        color: {theme["success_color"]};
     }}
     
     .negative-change {{
-        color: {current_theme["danger_color"]};
+        color: {theme["danger_color"]};
     }}
     
     /* Sidebar */
     [data-testid="stSidebar"] {{
-        background-color: {current_theme["bg_color"]};
-        border-right: 1px solid {current_theme["border_color"]};
+        background-color: {theme["bg_color"]};
+        border-right: 1px solid {theme["border_color"]};
     }}
     
     [data-testid="stSidebar"] [data-testid="stMarkdown"] {{
-        color: {current_theme["text_color"]};
+        color: {theme["text_color"]};
     }}
     
     /* Cartes département */
     .department-card {{
-        background-color: {current_theme["card_bg"]};
+        background-color: {theme["card_bg"]};
         border-radius: 0.5rem;
         padding: 1.25rem;
         box-shadow: 0 4px 6px rgba(0, 0, 0, 0.3);
         margin-bottom: 1rem;
-        border-left: 4px solid {current_theme["primary_color"]};
+        border-left: 4px solid {theme["primary_color"]};
         transition: transform 0.2s ease;
     }}
     
+    /* Grille de cartes (3 par rangée) */
+    .card-grid {{
+        display: grid;
+        grid-template-columns: repeat(3, minmax(0, 1fr));
+        column-gap: 1rem;
+    }}
+    
+    @media (max-width: 640px) {{
+        .card-grid {{
+            grid-template-columns: 1fr;
+        }}
+    }}
+    
     .department-card:hover {{
         transform: translateY(-3px);
     }}
@@ -494,7 +661,7 @@ custom_css = f"""
     .department-title {{
         font-size: 1.1rem;
         font-weight: 600;
-        color: {current_theme["primary_color"]};
+        color: {theme["primary_color"]};
         margin-bottom: 0.75rem;
         letter-spacing: 0.5px;
     }}
@@ -503,24 +670,24 @@ custom_css = f"""
         display: flex;
         justify-content: space-between;
         margin-bottom: 0.5rem;
-        border-bottom: 1px solid {current_theme["border_color"]};
+        border-bottom: 1px solid {theme["border_color"]};
         padding-bottom: 0.25rem;
     }}
     
     .department-metric-label {{
-        color: {current_theme["text_muted"]};
+        color: {theme["text_muted"]};
         font-size: 0.85rem;
     }}
     
     .department-metric-value {{
         font-weight: 600;
-        color: {current_theme["secondary_color"]};
+        color: {theme["secondary_color"]};
     }}
     
     /* Alertes */
     .alert-card {{
         background-color: rgba(255, 193, 7, 0.15);
-        border-left: 4px solid {current_theme["warning_color"]};
+        border-left: 4px solid {theme["warning_color"]};
         border-radius: 0.5rem;
         padding: 1.25rem;
         margin-bottom: 1rem;
@@ -529,18 +696,18 @@ custom_css = f"""
     
     .alert-card-critical {{
         background-color: rgba(183, 28, 28, 0.15);
-        border-left: 4px solid {current_theme["danger_color"]};
+        border-left: 4px solid {theme["danger_color"]};
     }}
     
     .alert-title {{
         font-weight: 600;
-        color: {current_theme["warning_color"]};
+        color: {theme["warning_color"]};
         margin-bottom: 0.5rem;
         letter-spacing: 0.5px;
     }}
     
     .alert-title-critical {{
-        color: {current_theme["danger_color"]};
+        color: {theme["danger_color"]};
     }}
     
     .alert-message {{
@@ -555,7 +722,7 @@ custom_css = f"""
     /* Recommandations */
     .recommendation-card {{
         background-color: rgba(212, 175, 55, 0.1);
-        border-left: 4px solid {current_theme["primary_color"]};
+        border-left: 4px solid {theme["primary_color"]};
         border-radius: 0.5rem;
         padding: 1.25rem;
         margin-bottom: 1rem;
@@ -564,20 +731,20 @@ custom_css = f"""
     
     .recommendation-title {{
         font-weight: 600;
-        color: {current_theme["primary_color"]};
+        color: {theme["primary_color"]};
         margin-bottom: 0.5rem;
         letter-spacing: 0.5px;
     }}
     
     .recommendation-message {{
-        color: {current_theme["secondary_color"]};
+        color: {theme["secondary_color"]};
         font-size: 0.9rem;
     }}
     
     /* Résumé */
     .summary-card {{
         background-color: rgba(192, 192, 192, 0.1);
-        border-left: 4px solid {current_theme["secondary_color"]};
+        border-left: 4px solid {theme["secondary_color"]};
         border-radius: 0.5rem;
         padding: 1.25rem;
         margin-bottom: 1rem;
@@ -586,19 +753,19 @@ custom_css = f"""
     
     .summary-title {{
         font-weight: 600;
-        color: {current_theme["secondary_color"]};
+        color: {theme["secondary_color"]};
         margin-bottom: 0.5rem;
         letter-spacing: 0.5px;
     }}
     
     .summary-message {{
-        color: {current_theme["text_color"]};
+        color: {theme["text_color"]};
         font-size: 0.9rem;
     }}
     
     /* Tableaux */
     [data-testid="stTable"] {{
-        background-color: {current_theme["card_bg"]};
+        background-color: {theme["card_bg"]};
     }}
     
     div[data-testid="stVerticalBlock"] > div:has(div.block-container) {{
@@ -612,13 +779,13 @@ custom_css = f"""
     }}
     
     .stTabs [data-baseweb="tab"] {{
-        background-color: {current_theme["card_bg"]};
-        color: {current_theme["text_muted"]};
+        background-color: {theme["card_bg"]};
+        color: {theme["text_muted"]};
         border-radius: 4px 4px 0 0;
     }}
     
     .stTabs [aria-selected="true"] {{
-        background-color: {current_theme["primary_color"]} !important;
+        background-color: {theme["primary_color"]} !important;
         color: #000 !important;
     }}
     
@@ -626,7 +793,7 @@ custom_css = f"""
     [data-testid="stDateInput"] label,
     [data-testid="stSelectbox"] label,
     [data-testid="stMultiselect"] label {{
-        color: {current_theme["secondary_color"]} !important;
+        color: {theme["secondary_color"]} !important;
     }}
     
     /* Scrollbar personnalisée */
@@ -636,30 +803,30 @@ custom_css = f"""
     }}
     
     ::-webkit-scrollbar-track {{
-        background: {current_theme["bg_color"]};
+        background: {theme["bg_color"]};
     }}
     
     ::-webkit-scrollbar-thumb {{
-        background: {current_theme["border_color"]};
+        background: {theme["border_color"]};
         border-radius: 5px;
     }}
     
     ::-webkit-scrollbar-thumb:hover {{
-        background: {current_theme["primary_color"]};
+        background: {theme["primary_color"]};
     }}
     
     /* Paramètres */
     .settings-card {{
-        background-color: {current_theme["card_bg"]};
+        background-color: {theme["card_bg"]};
         border-radius: 0.5rem;
         padding: 1.25rem;
         margin-bottom: 1rem;
-        border-left: 4px solid {current_theme["secondary_color"]};
+        border-left: 4px solid {theme["secondary_color"]};
     }}
     
     .settings-title {{
         font-weight: 600;
-        color: {current_theme["secondary_color"]};
+        color: {theme["secondary_color"]};
         margin-bottom: 1rem;
         letter-spacing: 0.5px;
     }}
@@ -672,7 +839,7 @@ custom_css = f"""
     }}
     
     .compact-card {{
-        background-color: {current_theme["card_bg"]};
+        background-color: {theme["card_bg"]};
         border-radius: 0.5rem;
         padding: 1rem;
         box-shadow: 0 4px 6px rgba(0, 0, 0, 0.3);
@@ -682,80 +849,108 @@ custom_css = f"""
     .compact-title {{
         font-size: 1rem;
         font-weight: 600;
-        color: {current_theme["primary_color"]};
+        color: {theme["primary_color"]};
         margin-bottom: 0.5rem;
-        border-bottom: 1px solid {current_theme["border_color"]};
+        border-bottom: 1px solid {theme["border_color"]};
         padding-bottom: 0.25rem;
     }}
 </style>
 """
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    return re.sub(r'\s*([{};])\s*', r'\1', css).strip()
+
+@st.cache_resource
+def feuilles_de_style():
+    """
+    Compile une fois pour toutes la feuille de style de chaque thème
+    
+    La feuille du thème courant est réémise à chaque exécution (Streamlit
+    retire les éléments qui ne le sont pas), mais son contenu est identique
+    d'une exécution à l'autre : le serveur n'envoie alors qu'une référence
+    au message déjà reçu par le navigateur (voir .streamlit/config.toml).
+    
+    Returns:
+        dict: Clé du thème -> feuille de style minifiée
+    """
+    return {nom: construire_css(theme) for nom, theme in themes.items()}
 
-# Appliquer le CSS personnalisé
-st.markdown(custom_css, unsafe_allow_html=True)
+# Appliquer le CSS personnalisé du thème actuel
+st.markdown(feuilles_de_style()[st.session_state.theme], unsafe_allow_html=True)
 
 # -----------------------------------------------------------------------------
 # GÉNÉRATION DES DONNÉES D'EXEMPLE
 # -----------------------------------------------------------------------------
 
-def generer_donnees_exemple():
+def generer_donnees_exemple(n_patients=1000, n_personnel=200, jours=90):
     """
     Génère des données d'exemple pour le tableau de bord
     
+    Toutes les colonnes sont produites par des opérations NumPy sur des
+    tableaux entiers (dates en datetime64), sans boucle Python par ligne :
+    l'échantillon peut compter des millions de patients.
+    
+    Args:
+        n_patients: Nombre de patients
+        n_personnel: Nombre de membres du personnel
+        jours: Nombre de jours de métriques quotidiennes
+    
     Returns:
         tuple: (patients_df, personnel_df, departements_df, quotidien_df)
     """
-    # Traduire les noms de départements selon la langue actuelle
+    # Catégories stockées sous forme de clés de traduction (traduites à l'affichage)
     departements = [
-        t("cardiology"), t("neurology"), t("oncology"), 
-        t("pediatrics"), t("emergency"), t("surgery")
+        "cardiology", "neurology", "oncology", 
+        "pediatrics", "emergency", "surgery"
     ]
     
     traitements = [
-        t("medication"), t("surgery_treatment"), t("therapy"), 
-        t("observation"), t("intensive_care")
+        "medication", "surgery_treatment", "therapy", 
+        "observation", "intensive_care"
     ]
     
     resultats = [
-        t,  t("therapy"), 
-        t("observation"), t("intensive_care") ]
-    
-    
-    resultats = [
-        t("recovered"), t("improved"), t("stable"), 
-        t("deteriorated"), t("deceased"), t("in_treatment")
+        "recovered", "improved", "stable", 
+        "deteriorated", "deceased", "in_treatment"
     ]
     
+    maintenant = np.datetime64(datetime.now())
+    
     # Données des patients
+    date_admission = maintenant - np.random.randint(1, jours, n_patients).astype('timedelta64[D]')
+    duree_hospitalisation = np.random.randint(1, 30, n_patients)
+    est_hospitalise = np.random.choice([True, False], n_patients, p=[0.3, 0.7])
+    
     patients = pd.DataFrame({
-        'idPatient': [f'P{1000+i}' for i in range(1000)],
-        'age': np.random.randint(1, 95, 1000),
-        'sexe': np.random.choice(['Homme', 'Femme'], 1000),
-        'departement': np.random.choice(departements, 1000),
-        'dateAdmission': [datetime.now() - timedelta(days=np.random.randint(1, 90)) for _ in range(1000)],
-        'dureeHospitalisation': np.random.randint(1, 30, 1000),
-        'traitement': np.random.choice(traitements, 1000),
-        'resultat': np.random.choice(resultats, 1000),
-        'coutTraitement': np.random.randint(1000, 20000, 1000),
-        'couvertureAssurance': np.random.randint(500, 15000, 1000),
-        'estHospitalise': np.random.choice([True, False], 1000, p=[0.3, 0.7])
+        'idPatient': np.char.add('P', np.arange(1000, 1000 + n_patients).astype(str)),
+        'age': np.random.randint(1, 95, n_patients),
+        'sexe': np.random.choice(['Homme', 'Femme'], n_patients),
+        'departement': np.random.choice(departements, n_patients),
+        'dateAdmission': date_admission,
+        'dureeHospitalisation': duree_hospitalisation,
+        'traitement': np.random.choice(traitements, n_patients),
+        'resultat': np.random.choice(resultats, n_patients),
+        'coutTraitement': np.random.randint(1000, 20000, n_patients),
+        'couvertureAssurance': np.random.randint(500, 15000, n_patients),
+        'estHospitalise': est_hospitalise,
+        # Date de sortie : admission + durée d'hospitalisation, NaT pour les patients encore hospitalisés
+        'dateSortie': np.where(
+            est_hospitalise,
+            np.datetime64('NaT'),
+            date_admission + duree_hospitalisation.astype('timedelta64[D]')
+        )
     })
     
-    # Calculer la date de sortie en fonction de la date d'admission et de la durée d'hospitalisation
-    patients['dateSortie'] = patients.apply(
-        lambda x: None if x['estHospitalise'] else x['dateAdmission'] + timedelta(days=x['dureeHospitalisation']), 
-        axis=1
-    )
-    
     # Données du personnel
-    roles = [t("doctor"), t("nurse"), t("technician"), t("administrative"), t("support")]
+    roles = ["doctor", "nurse", "technician", "administrative", "support"]
     personnel = pd.DataFrame({
-        'idPersonnel': [f'S{1000+i}' for i in range(200)],
-        'departement': np.random.choice(departements + [t("administration")], 200),
-        'role': np.random.choice(roles, 200),
-        'anneeService': np.random.randint(0, 30, 200),
-        'salaire': np.random.randint(40000, 200000, 200),
-        'patientsTraites': np.random.randint(0, 100, 200),
-        'scorePerformance': np.random.uniform(0.7, 1.0, 200)
+        'idPersonnel': np.char.add('S', np.arange(1000, 1000 + n_personnel).astype(str)),
+        'departement': np.random.choice(departements + ["administration"], n_personnel),
+        'role': np.random.choice(roles, n_personnel),
+        'anneeService': np.random.randint(0, 30, n_personnel),
+        'salaire': np.random.randint(40000, 200000, n_personnel),
+        'patientsTraites': np.random.randint(0, 100, n_personnel),
+        'scorePerformance': np.random.uniform(0.7, 1.0, n_personnel)
     })
     
     # Données des départements
@@ -777,15 +972,14 @@ def generer_donnees_exemple():
     departements_df['tauxOccupation'] = departements_df['patientsActuels'] / departements_df['litsDisponibles']
     
     # Métriques quotidiennes
-    dates = [datetime.now() - timedelta(days=i) for i in range(90)]
     quotidien = pd.DataFrame({
-        'date': dates,
-        'nouvellesAdmissions': np.random.randint(5, 25, 90),
-        'sorties': np.random.randint(5, 20, 90),
-        'visiteUrgences': np.random.randint(20, 60, 90),
-        'operations': np.random.randint(3, 15, 90),
-        'revenus': np.random.randint(50000, 150000, 90),
-        'depenses': np.random.randint(40000, 120000, 90)
+        'date': maintenant - np.arange(jours).astype('timedelta64[D]'),
+        'nouvellesAdmissions': np.random.randint(5, 25, jours),
+        'sorties': np.random.randint(5, 20, jours),
+        'visiteUrgences': np.random.randint(20, 60, jours),
+        'operations': np.random.randint(3, 15, jours),
+        'revenus': np.random.randint(50000, 150000, jours),
+        'depenses': np.random.randint(40000, 120000, jours)
     })
     
     return patients, personnel, departements_df, quotidien
@@ -794,291 +988,1703 @@ def generer_donnees_exemple():
 # CHARGEMENT DES DONNÉES
 # -----------------------------------------------------------------------------
 
-@st.cache_data
-def charger_donnees():
-    """
-    Charge les données depuis des fichiers JSON ou génère des données d'exemple
-    
-    Returns:
-        tuple: (patients_df, personnel_df, departements_df, quotidien_df)
-    """
-    try:
-        # Essayer de charger à partir des fichiers JSON s'ils existent
-        if os.path.exists('./data/patients.json'):
-            # Code pour charger les données depuis les fichiers JSON
-            # Omis pour la brièveté - utiliser le code de génération de données à la place
-            return generer_donnees_exemple()
-        else:
-            # Si les fichiers n'existent pas, générer des données d'exemple
-            st.info("Fichiers de données non trouvés. Utilisation de données d'exemple générées.")
-            return generer_donnees_exemple()
-    except Exception as e:
-        st.warning(f"Erreur lors du chargement des données: {e}. Utilisation de données d'exemple générées.")
-        return generer_donnees_exemple()
+# Dossier des fichiers JSON produits par generate_health_data.py
+DOSSIER_DONNEES = './data'
+# Dossier des instantanés colonnaires (Parquet) construits à partir des fichiers JSON
+DOSSIER_CACHE = os.path.join(DOSSIER_DONNEES, '.cache')
+# Nombre d'enregistrements par bloc lors de la lecture en flux des fichiers JSON
+TAILLE_BLOC = 100_000
 
-# Charger les données
-patients_df, personnel_df, departements_df, quotidien_df = charger_donnees()
+# Correspondance des clés JSON (anglais) vers le schéma du tableau de bord
+COLONNES_PATIENTS = {
+    'patientId': 'idPatient',
+    'age': 'age',
+    'gender': 'sexe',
+    'department': 'departement',
+    'admissionDate': 'dateAdmission',
+    'stayDuration': 'dureeHospitalisation',
+    'treatment': 'traitement',
+    'outcome': 'resultat',
+    'treatmentCost': 'coutTraitement',
+    'insuranceCovered': 'couvertureAssurance',
+    'isAdmitted': 'estHospitalise',
+    'dischargeDate': 'dateSortie'
+}
 
-# -----------------------------------------------------------------------------
-# BARRE LATÉRALE ET PARAMÈTRES
-# -----------------------------------------------------------------------------
+COLONNES_PERSONNEL = {
+    'staffId': 'idPersonnel',
+    'department': 'departement',
+    'role': 'role',
+    'yearsOfService': 'anneeService',
+    'salary': 'salaire',
+    'patientsHandled': 'patientsTraites',
+    'performanceScore': 'scorePerformance'
+}
 
-# Barre latérale
-# st.sidebar.image("https://img.icons8.com/color/96/000000/hospital-3.png", width=80)
-st.sidebar.title(t("sidebar_title"))
-st.sidebar.markdown(f"<div style='color: {current_theme['primary_color']}; margin-bottom: 20px; font-weight: 500;'>{t('sidebar_subtitle')}</div>", unsafe_allow_html=True)
+COLONNES_DEPARTEMENTS = {
+    'department': 'departement',
+    'totalPatients': 'totalPatients',
+    'avgStayDuration': 'dureeHospitalisationMoyenne',
+    'totalRevenue': 'revenusTotal',
+    'totalSalaries': 'totalSalaires',
+    'operatingCost': 'coutFonctionnement',
+    'recoveryRate': 'tauxRetablissement',
+    'bedsAvailable': 'litsDisponibles',
+    'currentlyAdmitted': 'patientsActuels',
+    'staffCount': 'nombrePersonnel',
+    'doctorCount': 'nombreMedecins',
+    'nurseCount': 'nombreInfirmiers',
+    'bedUtilization': 'tauxOccupation'
+}
 
-# Section des paramètres
-st.sidebar.markdown("---")
-st.sidebar.markdown(f"<div style='color: {current_theme['secondary_color']}; font-weight: 500;'>{t('settings')}</div>", unsafe_allow_html=True)
+COLONNES_QUOTIDIEN = {
+    'date': 'date',
+    'newAdmissions': 'nouvellesAdmissions',
+    'discharges': 'sorties',
+    'emergencyVisits': 'visiteUrgences',
+    'surgeries': 'operations',
+    'revenue': 'revenus',
+    'expenses': 'depenses'
+}
 
-# Sélection de la langue
-language_options = {"fr": "Français", "en": "English"}
-selected_language = st.sidebar.selectbox(
-    t("language"),
-    options=list(language_options.keys()),
-    format_func=lambda x: language_options[x],
-    index=list(language_options.keys()).index(st.session_state.language)
-)
+# Correspondance des valeurs catégorielles JSON vers les clés de traduction
+CLES_DEPARTEMENTS = {
+    'Cardiology': 'cardiology',
+    'Neurology': 'neurology',
+    'Oncology': 'oncology',
+    'Pediatrics': 'pediatrics',
+    'Emergency': 'emergency',
+    'Surgery': 'surgery',
+    'Administration': 'administration'
+}
 
-if selected_language != st.session_state.language:
-    st.session_state.language = selected_language
-    st.rerun()
+CLES_TRAITEMENTS = {
+    'Medication': 'medication',
+    'Surgery': 'surgery_treatment',
+    'Therapy': 'therapy',
+    'Observation': 'observation',
+    'Intensive Care': 'intensive_care'
+}
 
-# Sélection du thème
-theme_options = {k: v["name"] for k, v in themes.items()}
-selected_theme = st.sidebar.selectbox(
-    t("theme"),
-    options=list(theme_options.keys()),
-    format_func=lambda x: theme_options[x],
-    index=list(theme_options.keys()).index(st.session_state.theme)
-)
+CLES_RESULTATS = {
+    'Recovered': 'recovered',
+    'Improved': 'improved',
+    'Stable': 'stable',
+    'Deteriorated': 'deteriorated',
+    'Deceased': 'deceased',
+    'In Treatment': 'in_treatment'
+}
 
-if selected_theme != st.session_state.theme:
-    st.session_state.theme = selected_theme
-    st.rerun()
+CLES_ROLES = {
+    'Doctor': 'doctor',
+    'Nurse': 'nurse',
+    'Technician': 'technician',
+    'Administrative': 'administrative',
+    'Support': 'support'
+}
 
-# Sélection de la devise
-currency_options = {"eur": t("eur"), "fcfa": t("fcfa")}
-selected_currency = st.sidebar.selectbox(
-    t("currency"),
-    options=list(currency_options.keys()),
-    format_func=lambda x: currency_options[x],
-    index=list(currency_options.keys()).index(st.session_state.currency)
-)
+# Le sexe n'est pas traduit dans les données d'exemple
+SEXES = {'Male': 'Homme', 'Female': 'Femme'}
 
-if selected_currency != st.session_state.currency:
-    st.session_state.currency = selected_currency
-    st.rerun()
+def signature_fichier(chemin):
+    """Identifie une version d'un fichier par sa date de modification et sa taille"""
+    stat = os.stat(chemin)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
 
-# Option de mode compact
-compact_mode = st.sidebar.checkbox(
-    t("enable_compact"),
-    value=st.session_state.compact_mode
-)
+def ecrire_instantane(df, nom, chemin_instantane):
+    """
+    Écrit l'instantané Parquet d'une table et supprime les instantanés périmés
+    
+    L'écriture passe par un fichier temporaire renommé atomiquement, afin qu'un
+    autre processus ne lise jamais un instantané incomplet. Si pyarrow n'est pas
+    disponible ou si le dossier n'est pas accessible en écriture, l'instantané
+    est simplement ignoré.
+    """
+    try:
+        os.makedirs(DOSSIER_CACHE, exist_ok=True)
+        for ancien in glob.glob(os.path.join(DOSSIER_CACHE, f'{nom}-*.parquet')):
+            os.remove(ancien)
+        temporaire = f'{chemin_instantane}.{os.getpid()}.tmp'
+        df.to_parquet(temporaire, index=False)
+        os.replace(temporaire, chemin_instantane)
+    except (ImportError, OSError) as e:
+        journal.warning("Instantané Parquet de la table %s non écrit: %s", nom, e)
 
-if compact_mode != st.session_state.compact_mode:
-    st.session_state.compact_mode = compact_mode
-    st.rerun()
+def chemin_source(nom):
+    """
+    Retourne le fichier source d'une table, en privilégiant le format NDJSON
+    
+    Returns:
+        str: Chemin du fichier .ndjson ou .json, None si aucun n'existe
+    """
+    for extension in ('ndjson', 'json'):
+        chemin = os.path.join(DOSSIER_DONNEES, f'{nom}.{extension}')
+        if os.path.exists(chemin):
+            return chemin
+    return None
 
-# Séparateur
-st.sidebar.markdown("---")
+def lire_enregistrements_json(chemin, taille_tampon=1 << 20):
+    """
+    Parcourt un fichier JSON enregistrement par enregistrement
+    
+    Accepte un tableau JSON (éventuellement indenté) comme un fichier NDJSON
+    (un objet par ligne). Le tableau est décodé élément par élément à partir
+    d'un tampon de taille fixe : la mémoire utilisée ne dépend pas de la
+    taille du fichier.
+    
+    Args:
+        chemin: Chemin du fichier à lire
+        taille_tampon: Nombre de caractères lus à chaque accès disque
+    
+    Yields:
+        dict: Un enregistrement du fichier
+    """
+    decodeur = json.JSONDecoder()
+    with open(chemin, encoding='utf-8') as f:
+        tampon = f.read(taille_tampon).lstrip()
+        
+        # Format NDJSON : un objet par ligne
+        if not tampon.startswith('['):
+            f.seek(0)
+            for ligne in f:
+                if ligne.strip():
+                    yield json.loads(ligne)
+            return
+        
+        # Tableau JSON : décodage incrémental des éléments
+        position = 1
+        fin_fichier = False
+        while True:
+            # Sauter les espaces et séparateurs entre deux éléments
+            while position < len(tampon) and tampon[position] in ' \t\r\n,':
+                position += 1
+            if position < len(tampon) and tampon[position] == ']':
+                return
+            try:
+                enregistrement, suivant = decodeur.raw_decode(tampon, position)
+            except json.JSONDecodeError:
+                # Élément incomplet : compléter le tampon avant de réessayer
+                if fin_fichier:
+                    raise
+                complement = f.read(taille_tampon)
+                fin_fichier = not complement
+                tampon = tampon[position:] + complement
+                position = 0
+                continue
+            yield enregistrement
+            position = suivant
 
-# Filtres
-# Filtre de date
-min_date = quotidien_df['date'].min().date()
-max_date = quotidien_df['date'].max().date()
-plage_date = st.sidebar.date_input(
-    t("date_range"),
-    value=(min_date, max_date),
-    min_value=min_date,
-    max_value=max_date
-)
+def normaliser_table(df, colonnes, dates=(), valeurs=None):
+    """Renomme et type une table JSON selon le schéma du tableau de bord"""
+    df = df.rename(columns=colonnes).reindex(columns=list(colonnes.values()))
+    for colonne in dates:
+        df[colonne] = pd.to_datetime(df[colonne])
+    for colonne, correspondance in (valeurs or {}).items():
+        # Les valeurs inconnues sont conservées telles quelles
+        df[colonne] = df[colonne].map(correspondance).fillna(df[colonne])
+    return df
 
-# Filtre de département
-tous_departements = [t("all_departments")] + list(departements_df['departement'].unique())
-departement_selectionne = st.sidebar.selectbox(t("department"), tous_departements)
+def lire_json_par_blocs(chemin, colonnes, dates=(), valeurs=None, taille_bloc=TAILLE_BLOC):
+    """
+    Lit un fichier JSON en flux et produit des DataFrames typés de taille bornée
+    
+    Args:
+        chemin: Chemin du fichier JSON ou NDJSON
+        colonnes: Correspondance clés JSON -> colonnes du tableau de bord
+        dates: Colonnes à convertir en datetime
+        valeurs: Correspondances de valeurs par colonne
+        taille_bloc: Nombre maximal d'enregistrements par bloc
+    
+    Yields:
+        DataFrame: Un bloc d'au plus taille_bloc lignes
+    """
+    bloc = []
+    for enregistrement in lire_enregistrements_json(chemin):
+        bloc.append(enregistrement)
+        if len(bloc) >= taille_bloc:
+            yield normaliser_table(pd.DataFrame.from_records(bloc), colonnes, dates, valeurs)
+            bloc = []
+    if bloc:
+        yield normaliser_table(pd.DataFrame.from_records(bloc), colonnes, dates, valeurs)
 
-# Filtres supplémentaires
-st.sidebar.markdown("---")
-st.sidebar.markdown(f"<div style='color: {current_theme['secondary_color']}; font-weight: 500;'>{t('advanced_filters')}</div>", unsafe_allow_html=True)
-filtre_traitement = st.sidebar.multiselect(
-    t("treatment_type"),
-    options=patients_df['traitement'].unique(),
-    default=[]
-)
+def charger_table(nom, colonnes, dates=(), valeurs=None):
+    """
+    Charge une table JSON en la renommant selon le schéma du tableau de bord
+    
+    Args:
+        nom: Nom du fichier JSON ou NDJSON (sans extension) dans DOSSIER_DONNEES
+        colonnes: Correspondance clés JSON -> colonnes du tableau de bord
+        dates: Colonnes à convertir en datetime
+        valeurs: Correspondances de valeurs par colonne (ex: 'Cardiology' -> 'cardiology')
+    
+    Returns:
+        DataFrame: La table chargée, depuis l'instantané Parquet s'il est à jour
+    """
+    chemin = chemin_source(nom)
+    chemin_instantane = os.path.join(DOSSIER_CACHE, f'{nom}-{signature_fichier(chemin)}.parquet')
+    
+    if os.path.exists(chemin_instantane):
+        try:
+            return pd.read_parquet(chemin_instantane)
+        except (ImportError, OSError):
+            pass
+    
+    # Lecture en flux : seuls les blocs typés sont conservés en mémoire
+    blocs = list(lire_json_par_blocs(chemin, colonnes, dates, valeurs))
+    if blocs:
+        df = pd.concat(blocs, ignore_index=True)
+    else:
+        df = normaliser_table(pd.DataFrame(columns=list(colonnes)), colonnes, dates)
+    
+    ecrire_instantane(df, nom, chemin_instantane)
+    return df
 
-filtre_resultat = st.sidebar.multiselect(
-    t("patient_outcome"),
-    options=patients_df['resultat'].unique(),
-    default=[]
-)
+# Tables du tableau de bord, dans l'ordre du tuple de données : fichier source,
+# correspondance des colonnes, colonnes de dates et correspondances de valeurs
+SOURCES_TABLES = {
+    'patients': (
+        'patients', COLONNES_PATIENTS, ['dateAdmission', 'dateSortie'],
+        {
+            'sexe': SEXES,
+            'departement': CLES_DEPARTEMENTS,
+            'traitement': CLES_TRAITEMENTS,
+            'resultat': CLES_RESULTATS
+        }
+    ),
+    'personnel': ('staff', COLONNES_PERSONNEL, [], {'departement': CLES_DEPARTEMENTS, 'role': CLES_ROLES}),
+    'departements': ('departments', COLONNES_DEPARTEMENTS, [], {'departement': CLES_DEPARTEMENTS}),
+    'quotidien': ('daily_metrics', COLONNES_QUOTIDIEN, ['date'], None)
+}
 
-# -----------------------------------------------------------------------------
-# APPLICATION DES FILTRES
-# -----------------------------------------------------------------------------
+def charger_donnees_json(tables=tuple(SOURCES_TABLES)):
+    """
+    Charge les fichiers JSON produits par generate_health_data.py
+    
+    Args:
+        tables: Tables à charger (clés de SOURCES_TABLES) ; les autres valent None
+    
+    Returns:
+        tuple: (patients_df, personnel_df, departements_df, quotidien_df)
+    """
+    # Les catégories restent des clés de traduction : les tables chargées sont
+    # communes à toutes les langues et traduites à l'affichage (voir traduire)
+    return tuple(
+        charger_table(*source) if table in tables else None
+        for table, source in SOURCES_TABLES.items()
+    )
 
-# Appliquer les filtres
-if len(plage_date) == 2: 
-    date_debut, date_fin = plage_date
-    # Convertir en datetime pour une comparaison correcte
-    date_debut_dt = pd.Timestamp(date_debut)
-    date_fin_dt = pd.Timestamp(date_fin)
-    quotidien_filtre = quotidien_df[(quotidien_df['date'] >= date_debut_dt) & (quotidien_df['date'] <= date_fin_dt)]
-else:
-    quotidien_filtre = quotidien_df
-    # Par défaut à la plage complète si plage_date n'est pas correctement définie
-    date_debut = min_date
-    date_fin = max_date
+# Colonnes filtrables (Categorical, voir TYPES_COLONNES), avec un index de positions par catégorie
+COLONNES_CATEGORIELLES = {
+    'patients': ['departement', 'traitement', 'resultat'],
+    'personnel': ['departement', 'role']
+}
 
-# Appliquer le filtre de département
-if departement_selectionne != t("all_departments"):
-    patients_filtre = patients_df[patients_df['departement'] == departement_selectionne]
-    personnel_filtre = personnel_df[personnel_df['departement'] == departement_selectionne]
-    departements_filtre = departements_df[departements_df['departement'] == departement_selectionne]
-else:
-    patients_filtre = patients_df
-    personnel_filtre = personnel_df
-    departements_filtre = departements_df
+# Types compacts des colonnes, par table : entiers courts pour les comptages et les
+# montants (seulement s'ils sont entiers, voir compacter_colonne), Categorical pour
+# les colonnes peu diversifiées
+TYPES_COLONNES = {
+    'patients': {
+        'age': 'int8',
+        'sexe': 'category',
+        'departement': 'category',
+        'dureeHospitalisation': 'int16',
+        'traitement': 'category',
+        'resultat': 'category',
+        'coutTraitement': 'int32',
+        'couvertureAssurance': 'int32'
+    },
+    'personnel': {
+        'departement': 'category',
+        'role': 'category',
+        'anneeService': 'int8',
+        'salaire': 'int32',
+        'patientsTraites': 'int16',
+        'scorePerformance': 'float32'
+    },
+    'quotidien': {
+        'nouvellesAdmissions': 'int32',
+        'sorties': 'int32',
+        'visiteUrgences': 'int32',
+        'operations': 'int32',
+        'revenus': 'int32',
+        'depenses': 'int32'
+    }
+}
 
-# Appliquer le filtre de traitement
-if filtre_traitement:
-    patients_filtre = patients_filtre[patients_filtre['traitement'].isin(filtre_traitement)]
+# Identifiants stockés sous forme d'entiers ; le préfixe n'est rétabli qu'à l'affichage
+PREFIXES_IDENTIFIANTS = {'idPatient': 'P', 'idPersonnel': 'S'}
 
-# Appliquer le filtre de résultat
-if filtre_resultat:
-    patients_filtre = patients_filtre[patients_filtre['resultat'].isin(filtre_resultat)]
+def compacter_colonne(serie, type_cible):
+    """
+    Convertit une colonne dans son type compact
+    
+    Une colonne n'est convertie en entiers que si toutes ses valeurs sont des
+    nombres entiers, présents et dans les bornes du type cible : sinon (montants
+    avec décimales, valeurs manquantes...) elle est conservée telle quelle.
+    """
+    if type_cible == 'category' or np.issubdtype(np.dtype(type_cible), np.floating):
+        return serie.astype(type_cible)
+    if not pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_bool_dtype(serie) or serie.isna().any():
+        return serie
+    if not pd.api.types.is_integer_dtype(serie) and not (serie % 1 == 0).all():
+        return serie
+    bornes = np.iinfo(type_cible)
+    if not serie.between(bornes.min, bornes.max).all():
+        return serie
+    return serie.astype(type_cible)
 
-# -----------------------------------------------------------------------------
-# FONCTIONS D'ANALYSE ET DE GÉNÉRATION D'INSIGHTS
-# -----------------------------------------------------------------------------
+def compacter_identifiants(serie, prefixe):
+    """
+    Convertit des identifiants préfixés ('P1000') en entiers (1000)
+    
+    Les identifiants qui ne suivent pas tous ce format sont conservés tels quels.
+    """
+    texte = serie.astype(str)
+    numeros = pd.to_numeric(texte.str.slice(len(prefixe)), errors='coerce')
+    if not texte.str.startswith(prefixe).all() or numeros.isna().any():
+        return serie
+    return compacter_colonne(numeros, 'int32')
+
+def appliquer_schema(df, types):
+    """Convertit les colonnes d'une table dans leurs types compacts"""
+    if df is None:
+        return df
+    for colonne, type_cible in types.items():
+        if colonne in df.columns:
+            df[colonne] = compacter_colonne(df[colonne], type_cible)
+    for colonne, prefixe in PREFIXES_IDENTIFIANTS.items():
+        if colonne in df.columns:
+            df[colonne] = compacter_identifiants(df[colonne], prefixe)
+    return df
 
-def generer_alertes(departements, patients, quotidien):
+def compacter_donnees(patients, personnel, departements, quotidien):
     """
-    Génère des alertes basées sur les données
+    Convertit les tables dans les types compacts de TYPES_COLONNES
     
-    Args:
-        departements: DataFrame des départements
-        patients: DataFrame des patients
-        quotidien: DataFrame des métriques quotidiennes
+    Entiers de 8 à 32 bits, réels 32 bits, identifiants entiers et
+    Categorical pour les colonnes filtrables ou peu diversifiées.
     
     Returns:
-        list: Liste d'alertes avec titre, message, département et type
-    """
-    alertes = []
-    
-    # Alertes critiques
-    for _, dept in departements.iterrows():
-        # Alerte de taux d'occupation élevé
-        if dept['tauxOccupation'] > 0.9:
-            alertes.append({
-                'titre': f"Taux d'occupation critique en {dept['departement']}",
-                'message': f"Le taux d'occupation des lits est de {dept['tauxOccupation']*100:.1f}% ({dept['patientsActuels']} patients pour {dept['litsDisponibles']} lits).",
-                'departement': dept['departement'],
-                'type': 'critique'
-            })
-        
-        # Alerte de taux de rétablissement faible
-        if dept['tauxRetablissement'] < 0.7:
-            alertes.append({
-                'titre': f"Taux de rétablissement faible en {dept['departement']}",
-                'message': f"Le taux de rétablissement est de seulement {dept['tauxRetablissement']*100:.1f}%, ce qui est inférieur à l'objectif de 70%.",
-                'departement': dept['departement'],
-                'type': 'critique'
-            })
-        
-        # Alerte de ratio personnel/patients
-        ratio_medecins = dept['nombreMedecins'] / max(1, dept['patientsActuels'])
-        if ratio_medecins < 0.1:  # Moins de 1 médecin pour 10 patients
-            alertes.append({
-                'titre': f"Manque de médecins en {dept['departement']}",
-                'message': f"Ratio médecin/patients de 1:{int(1/ratio_medecins)}, ce qui est inférieur aux recommandations.",
-                'departement': dept['departement'],
-                'type': 'critique'
-            })
-    
-    # Alertes générales
-    # Tendance d'admissions vs sorties
-    if len(quotidien) >= 7:  # Au moins une semaine de données
-        derniere_semaine = quotidien.sort_values('date').tail(7)
-        admissions = derniere_semaine['nouvellesAdmissions'].sum()
-        sorties = derniere_semaine['sorties'].sum()
-        if admissions > sorties * 1.3:  # 30% plus d'admissions que de sorties
-            alertes.append({
-                'titre': "Déséquilibre admissions/sorties",
-                'message': f"Sur les 7 derniers jours, il y a eu {admissions} admissions pour seulement {sorties} sorties, ce qui indique une pression croissante sur les capacités.",
-                'departement': 'Tous',
-                'type': 'avertissement'
-            })
+        tuple: (patients_df, personnel_df, departements_df, quotidien_df)
+    """
+    patients = appliquer_schema(patients, TYPES_COLONNES['patients'])
+    personnel = appliquer_schema(personnel, TYPES_COLONNES['personnel'])
+    quotidien = appliquer_schema(quotidien, TYPES_COLONNES['quotidien'])
+    return patients, personnel, departements, quotidien
+
+def afficher_identifiants(serie):
+    """Rétablit le préfixe d'affichage d'une colonne d'identifiants entiers"""
+    if not pd.api.types.is_integer_dtype(serie):
+        return serie
+    return PREFIXES_IDENTIFIANTS[serie.name] + serie.astype(str)
+
+def preparer_donnees(patients, personnel, departements, quotidien):
+    """
+    Prépare les tables chargées pour le filtrage
     
-    # Alerte financière
-    if len(quotidien) >= 30:  # Au moins un mois de données
-        dernier_mois = quotidien.sort_values('date').tail(30)
-        revenus = dernier_mois['revenus'].sum()
-        depenses = dernier_mois['depenses'].sum()
-        if depenses > revenus:
-            alertes.append({
-                'titre': "Déficit financier",
-                'message': f"Sur les 30 derniers jours, les dépenses ({format_currency(depenses)}) ont dépassé les revenus ({format_currency(revenus)}), créant un déficit de {format_currency(depenses-revenus)}.",
-                'departement': 'Tous',
-                'type': 'avertissement'
-            })
+    Les patients et les métriques quotidiennes sont triés une fois par date,
+    ce qui permet de répondre aux filtres de dates par recherche dichotomique.
+    Les tables confiées à la base analytique SQL valent None.
     
-    return alertes
+    Returns:
+        tuple: (patients_df, personnel_df, departements_df, quotidien_df)
+    """
+    if patients is not None:
+        patients = patients.sort_values('dateAdmission', kind='stable', ignore_index=True)
+    quotidien = quotidien.sort_values('date', kind='stable', ignore_index=True)
+    return compacter_donnees(patients, personnel, departements, quotidien)
 
-def generer_recommandations(departements, patients, personnel, alertes):
+def bornes_periode(dates_triees, debut, fin):
     """
-    Génère des recommandations basées sur les données et les alertes
+    Encadre une période dans une colonne de dates triée, en O(log n)
     
     Args:
-        departements: DataFrame des départements
-        patients: DataFrame des patients
-        personnel: DataFrame du personnel
-        alertes: Liste des alertes générées
+        dates_triees: Series de dates triée par ordre croissant
+        debut: Début de la période (inclus)
+        fin: Fin de la période (incluse)
     
     Returns:
-        list: Liste de recommandations avec titre et message
+        tuple: Positions (premiere, derniere) telles que les lignes premiere:derniere
+        ont une date comprise entre debut et fin
     """
-    recommandations = []
+    valeurs = dates_triees.to_numpy()
+    premiere = np.searchsorted(valeurs, pd.Timestamp(debut).to_datetime64(), side='left')
+    derniere = np.searchsorted(valeurs, pd.Timestamp(fin).to_datetime64(), side='right')
+    return premiere, max(premiere, derniere)
+
+def construire_index_categories(serie):
+    """
+    Construit l'index des positions de lignes de chaque catégorie d'une colonne
     
-    # Recommandations basées sur les alertes
-    alertes_occupation = [a for a in alertes if "occupation" in a['titre'].lower()]
-    if alertes_occupation:
-        depts_concernes = [a['departement'] for a in alertes_occupation]
-        recommandations.append({
-            'titre': "Optimisation de la capacité d'accueil",
-            'message': f"Envisager d'augmenter la capacité en lits dans les départements suivants : {', '.join(depts_concernes)}. Alternativement, mettre en place un système de transfert vers d'autres établissements pour les cas non urgents."
-        })
+    Args:
+        serie: Series de type Categorical
     
-    # Recommandations pour l'amélioration des taux de rétablissement
-    alertes_retablissement = [a for a in alertes if "rétablissement" in a['titre'].lower()]
-    if alertes_retablissement:
-        depts_concernes = [a['departement'] for a in alertes_retablissement]
-        recommandations.append({
-            'titre': "Amélioration des taux de rétablissement",
-            'message': f"Analyser les protocoles de traitement dans les départements suivants : {', '.join(depts_concernes)}. Envisager une révision des protocoles de soins et une formation supplémentaire du personnel."
-        })
+    Returns:
+        dict: Catégorie -> tableau trié des positions des lignes correspondantes
+    """
+    codes = serie.cat.codes.to_numpy()
+    # Un tri stable conserve les positions croissantes au sein de chaque catégorie
+    ordre = np.argsort(codes, kind='stable')
+    bornes = np.searchsorted(codes[ordre], np.arange(len(serie.cat.categories) + 1))
+    return {
+        categorie: ordre[bornes[i]:bornes[i + 1]]
+        for i, categorie in enumerate(serie.cat.categories)
+    }
+
+# -----------------------------------------------------------------------------
+# DONNÉES PARTAGÉES ENTRE PROCESSUS
+# -----------------------------------------------------------------------------
+
+# Avec TABLEAU_BORD_MEMOIRE_PARTAGEE=1, les tables préparées sont écrites une fois
+# en fichiers NumPy, puis projetées en mémoire (lecture seule) par chaque processus
+# Streamlit de la machine : le système ne garde qu'une copie physique des colonnes.
+MEMOIRE_PARTAGEE = os.environ.get('TABLEAU_BORD_MEMOIRE_PARTAGEE', '0') not in ('', '0')
+# Dossier des tables partagées (un système de fichiers en mémoire comme /dev/shm convient)
+DOSSIER_PARTAGE = os.environ.get('TABLEAU_BORD_DOSSIER_PARTAGE', os.path.join(DOSSIER_CACHE, 'partage'))
+# Fichier décrivant les colonnes de chaque table partagée
+FICHIER_SCHEMA = 'schema.json'
+
+# Fichiers sources des tables, dans l'ordre du tuple de données
+TABLES_SOURCES = [fichier for fichier, *_ in SOURCES_TABLES.values()]
+
+def signature_donnees():
+    """
+    Identifie une version des données chargées
     
-    # Recommandations pour l'optimisation du personnel
-    alertes_personnel = [a for a in alertes if "médecins" in a['titre'].lower() or "personnel" in a['titre'].lower()]
-    if alertes_personnel:
-        depts_concernes = [a['departement'] for a in alertes_personnel]
-        recommandations.append({
-            'titre': "Optimisation des ressources humaines",
-            'message': f"Recruter du personnel supplémentaire ou réaffecter temporairement du personnel vers les départements suivants : {', '.join(depts_concernes)}. Envisager également des heures supplémentaires pour le personnel existant."
-        })
+    Returns:
+        str: Empreinte des fichiers sources, ou la date du jour pour les données d'exemple
+    """
+    chemins = [chemin for chemin in map(chemin_source, TABLES_SOURCES) if chemin is not None]
+    if not chemins:
+        return f"exemple-{datetime.now():%Y%m%d}"
+    empreinte = hashlib.sha1('|'.join(f"{chemin}:{signature_fichier(chemin)}" for chemin in chemins).encode())
+    return empreinte.hexdigest()[:16]
+
+def ecrire_table_partagee(df, dossier, nom):
+    """
+    Écrit chaque colonne d'une table dans son propre fichier .npy
+    
+    Les colonnes catégorielles sont écrites sous forme de codes, leurs
+    catégories étant conservées dans le schéma. Les colonnes de texte
+    (objets Python) ne peuvent pas être projetées et sont sérialisées.
+    
+    Returns:
+        list: Description des colonnes pour le schéma
+    """
+    colonnes = []
+    for position, colonne in enumerate(df.columns):
+        serie = df[colonne]
+        description = {'nom': colonne, 'fichier': f"{nom}-{position}.npy"}
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            valeurs = serie.cat.codes.to_numpy()
+            description['categories'] = serie.cat.categories.tolist()
+        else:
+            valeurs = serie.to_numpy()
+            description['objet'] = valeurs.dtype == object
+        np.save(os.path.join(dossier, description['fichier']), valeurs, allow_pickle=description.get('objet', False))
+        colonnes.append(description)
+    return colonnes
+
+def projeter_table_partagee(dossier, colonnes):
+    """
+    Reconstitue une table à partir de ses fichiers .npy projetés en mémoire
+    
+    Les colonnes numériques, booléennes et de dates ne sont pas copiées :
+    le DataFrame pointe directement sur les pages partagées, en lecture seule.
+    """
+    valeurs = {}
+    for description in colonnes:
+        chemin = os.path.join(dossier, description['fichier'])
+        if description.get('objet'):
+            valeurs[description['nom']] = np.load(chemin, allow_pickle=True)
+            continue
+        tableau = np.load(chemin, mmap_mode='r')
+        if 'categories' in description:
+            tableau = pd.Categorical.from_codes(tableau, categories=description['categories'])
+        valeurs[description['nom']] = tableau
+    return pd.DataFrame(valeurs, copy=False)
+
+def publier_tables(donnees, statut, dossier):
+    """
+    Écrit les tables préparées dans le dossier partagé
+    
+    L'écriture passe par un dossier temporaire renommé atomiquement : un autre
+    processus ne projette jamais un jeu de tables incomplet. Si un autre
+    processus a publié les mêmes données entre-temps, sa version est conservée.
+    
+    Returns:
+        bool: True si le dossier partagé est disponible, False sinon
+    """
+    temporaire = f"{dossier}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(temporaire, exist_ok=True)
+        schema = {
+            'statut': statut,
+            'tables': [
+                ecrire_table_partagee(df, temporaire, nom) if df is not None else None
+                for nom, df in zip(TABLES_SOURCES, donnees)
+            ]
+        }
+        with open(os.path.join(temporaire, FICHIER_SCHEMA), 'w', encoding='utf-8') as f:
+            json.dump(schema, f)
+        os.rename(temporaire, dossier)
+    except OSError:
+        shutil.rmtree(temporaire, ignore_errors=True)
+        return os.path.exists(os.path.join(dossier, FICHIER_SCHEMA))
+    
+    # Les versions périmées peuvent être supprimées même si d'autres processus
+    # les projettent encore : leurs pages restent valides jusqu'à leur fermeture
+    for ancien in glob.glob(os.path.join(DOSSIER_PARTAGE, 'donnees-*')):
+        if ancien != dossier and not ancien.endswith('.tmp'):
+            shutil.rmtree(ancien, ignore_errors=True)
+    return True
+
+def charger_tables_partagees():
+    """
+    Projette en mémoire les tables partagées, en les publiant si besoin
+    
+    Le premier processus qui ne trouve pas la version courante des données
+    la construit et la publie ; les suivants se contentent de la projeter.
+    
+    Returns:
+        tuple: ((patients_df, personnel_df, departements_df, quotidien_df), statut)
+    """
+    # Les tables publiées diffèrent selon que patients et personnel sont dans la base SQL
+    moteur = 'sql-' if sql_actif() else ''
+    dossier = os.path.join(DOSSIER_PARTAGE, f"donnees-{moteur}{signature_donnees()}")
+    chemin_schema = os.path.join(dossier, FICHIER_SCHEMA)
+    if not os.path.exists(chemin_schema):
+        donnees, statut = construire_tables()
+        if not publier_tables(donnees, statut, dossier):
+            # Dossier partagé inaccessible : tables propres au processus
+            return donnees, statut
+    
+    with open(chemin_schema, encoding='utf-8') as f:
+        schema = json.load(f)
+    donnees = tuple(
+        projeter_table_partagee(dossier, colonnes) if colonnes is not None else None
+        for colonnes in schema['tables']
+    )
+    statut = tuple(schema['statut']) if schema['statut'] else None
+    return donnees, statut
+
+# -----------------------------------------------------------------------------
+# BASE ANALYTIQUE SQL
+# -----------------------------------------------------------------------------
+
+# Avec TABLEAU_BORD_MOTEUR=sql, les patients et le personnel ne sont pas chargés en
+# mémoire : ils sont copiés une fois dans une base analytique embarquée (DuckDB s'il
+# est installé, SQLite sinon), qui applique les filtres et calcule les agrégats.
+# Seuls les résultats, de quelques lignes, sont lus en Python.
+MOTEUR_SQL = os.environ.get('TABLEAU_BORD_MOTEUR', 'pandas') == 'sql'
+
+# Tables copiées dans la base ; les autres (une ligne par département ou par jour) restent en mémoire
+TABLES_SQL = ('patients', 'personnel')
+# Colonnes indexées dans une base SQLite (DuckDB parcourt ses colonnes sans index)
+COLONNES_INDEXEES_SQL = {
+    'patients': ['departement', 'traitement', 'resultat', 'dateAdmission'],
+    'personnel': ['departement']
+}
+# Colonnes booléennes, stockées en entiers 0/1 par SQLite
+COLONNES_BOOLEENNES_SQL = ['estHospitalise']
+# Ordre des lignes sans tri demandé, celui des tables en mémoire (voir preparer_donnees)
+ORDRE_TABLES_SQL = {'patients': '"dateAdmission", rowid', 'personnel': 'rowid'}
+
+def module_sql():
+    """Module DB-API de la base analytique : DuckDB s'il est installé, SQLite sinon"""
+    try:
+        import duckdb
+        return duckdb
+    except ImportError:
+        return sqlite3
+
+def blocs_table_sql(table):
+    """
+    Blocs de lignes d'une table à copier dans la base analytique
+    
+    Les fichiers JSON sont lus en flux (voir lire_json_par_blocs) ; à défaut,
+    la table est tirée des données d'exemple.
+    """
+    fichier, colonnes, dates, valeurs = SOURCES_TABLES[table]
+    chemin = chemin_source(fichier)
+    if chemin is None:
+        yield generer_donnees_exemple()[list(SOURCES_TABLES).index(table)]
+        return
+    
+    vide = True
+    for bloc in lire_json_par_blocs(chemin, colonnes, dates, valeurs):
+        vide = False
+        yield bloc
+    if vide:
+        # Une table vide est tout de même créée, avec ses colonnes
+        yield normaliser_table(pd.DataFrame(columns=list(colonnes)), colonnes, dates)
+
+def inserer_bloc(connexion, table, bloc):
+    """Ajoute un bloc de lignes à une table de la base, en la créant au premier bloc"""
+    if isinstance(connexion, sqlite3.Connection):
+        bloc.to_sql(table, connexion, if_exists='append', index=False)
+        return
+    connexion.register('bloc', bloc)
+    connexion.execute(f"CREATE TABLE IF NOT EXISTS {table} AS SELECT * FROM bloc LIMIT 0")
+    connexion.execute(f"INSERT INTO {table} SELECT * FROM bloc")
+    connexion.unregister('bloc')
+
+def construire_base(module, chemin):
+    """
+    Copie les patients et le personnel dans une nouvelle base analytique
+    
+    Seul un bloc de TAILLE_BLOC lignes est en mémoire à la fois : la base peut
+    dépasser la mémoire disponible. L'écriture passe par un fichier temporaire
+    renommé atomiquement, et les bases des versions précédentes sont supprimées.
+    """
+    os.makedirs(DOSSIER_CACHE, exist_ok=True)
+    temporaire = f"{chemin}.{os.getpid()}.tmp"
+    if os.path.exists(temporaire):
+        os.remove(temporaire)
+    
+    connexion = module.connect(temporaire)
+    try:
+        for table in TABLES_SQL:
+            for bloc in blocs_table_sql(table):
+                inserer_bloc(connexion, table, bloc)
+            if module is sqlite3:
+                for colonne in COLONNES_INDEXEES_SQL[table]:
+                    connexion.execute(f'CREATE INDEX index_{table}_{colonne} ON {table} ("{colonne}")')
+                connexion.commit()
+    finally:
+        connexion.close()
+    os.replace(temporaire, chemin)
+    
+    for ancien in glob.glob(os.path.join(DOSSIER_CACHE, 'analyse-*')):
+        if ancien != chemin and not ancien.endswith('.tmp'):
+            os.remove(ancien)
+
+@st.cache_resource(max_entries=1)
+def base_analytique(version):
+    """
+    Construit une fois la base analytique d'une version des données
+    
+    La base est un fichier du dossier de cache : les processus d'une même
+    machine la construisent une fois, puis l'ouvrent en lecture seule.
+    
+    Args:
+        version: Signature des données (signature_donnees())
+    
+    Returns:
+        tuple: (module DB-API, chemin de la base), None si elle n'a pas pu être construite
+    """
+    module = module_sql()
+    chemin = os.path.join(DOSSIER_CACHE, f"analyse-{version}.{module.__name__}")
+    if not os.path.exists(chemin):
+        try:
+            construire_base(module, chemin)
+        except Exception:
+            journal.exception("Impossible de construire la base analytique %s", chemin)
+            return None
+    return module, chemin
+
+def sql_actif():
+    """Indique si les patients et le personnel sont servis par la base analytique"""
+    return MOTEUR_SQL and base_analytique(signature_donnees()) is not None
+
+# Une connexion par fil d'exécution : les sessions Streamlit s'exécutent dans
+# des fils distincts, qui ne peuvent pas partager une connexion SQLite
+@st.cache_resource
+def connexions_sql():
+    """Connexions ouvertes à la base analytique, par fil d'exécution"""
+    return threading.local()
+
+def connexion_sql():
+    """Connexion en lecture seule du fil courant à la base analytique"""
+    module, chemin = base_analytique(signature_donnees())
+    locales = connexions_sql()
+    if getattr(locales, 'chemin', None) != chemin:
+        if module is sqlite3:
+            locales.connexion = sqlite3.connect(f"file:{chemin}?mode=ro", uri=True)
+        else:
+            locales.connexion = module.connect(chemin, read_only=True)
+        locales.chemin = chemin
+    return locales.connexion
+
+def executer_sql(requete, parametres=()):
+    """
+    Exécute une requête sur la base analytique
+    
+    Returns:
+        DataFrame: Le résultat de la requête
+    """
+    curseur = connexion_sql().execute(requete, list(parametres))
+    colonnes = [description[0] for description in curseur.description]
+    return pd.DataFrame(curseur.fetchall(), columns=colonnes)
+
+def filtres_sql(table, departement, filtre_traitement=(), filtre_resultat=()):
+    """
+    Traduit les filtres de la barre latérale en clause WHERE
+    
+    Returns:
+        tuple: (clause, paramètres), la clause étant vide sans filtre
+    """
+    selections = [('departement', (departement,) if departement is not None else ())]
+    if table == 'patients':
+        selections += [('traitement', filtre_traitement), ('resultat', filtre_resultat)]
+    
+    conditions, parametres = [], []
+    for colonne, valeurs in selections:
+        if valeurs:
+            conditions.append(f"{colonne} IN ({', '.join('?' * len(valeurs))})")
+            parametres.extend(valeurs)
+    clause = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+    return clause, parametres
+
+# -----------------------------------------------------------------------------
+# CHARGEMENT DES TABLES
+# -----------------------------------------------------------------------------
+
+def construire_tables():
+    """
+    Charge les données depuis des fichiers JSON ou génère des données d'exemple
+    
+    Avec le moteur SQL, seules les tables absentes de la base analytique
+    sont chargées en mémoire ; les autres valent None.
+    
+    Returns:
+        tuple: ((patients_df, personnel_df, departements_df, quotidien_df), statut)
+        où statut vaut None ou (niveau, message) à afficher
+    """
+    tables = [table for table in SOURCES_TABLES if not (sql_actif() and table in TABLES_SQL)]
+    statut = None
+    try:
+        # Charger à partir des fichiers JSON s'ils existent
+        if chemin_source('patients') is not None:
+            donnees = charger_donnees_json(tables)
+        else:
+            # Si les fichiers n'existent pas, générer des données d'exemple
+            statut = ('info', "Fichiers de données non trouvés. Utilisation de données d'exemple générées.")
+            donnees = generer_donnees_exemple()
+    except Exception as e:
+        statut = ('warning', f"Erreur lors du chargement des données: {e}. Utilisation de données d'exemple générées.")
+        donnees = generer_donnees_exemple()
+    
+    donnees = tuple(df if table in tables else None for table, df in zip(SOURCES_TABLES, donnees))
+    return preparer_donnees(*donnees), statut
+
+# Mis en cache comme ressource : les tables sont partagées sans copie entre les
+# réexécutions (st.cache_data en renverrait une copie complète à chaque appel).
+# La signature des données fait partie de la clé : les tables sont rechargées
+# dès que les fichiers sources changent, et seule la dernière version est gardée.
+@st.cache_resource(max_entries=1)
+def charger_tables(version):
+    """
+    Charge les tables du tableau de bord, une fois par version des données
+    
+    Aucun message n'est affiché ici : les fonctions en cache qui appellent
+    charger_donnees() rejoueraient sinon ce message à chaque réexécution.
+    
+    Args:
+        version: Signature des données (signature_donnees())
+    
+    Returns:
+        tuple: ((patients_df, personnel_df, departements_df, quotidien_df), statut)
+        où statut vaut None ou (niveau, message) à afficher
+    """
+    donnees, statut = charger_tables_partagees() if MEMOIRE_PARTAGEE else construire_tables()
+    if MOTEUR_SQL and not sql_actif() and statut is None:
+        statut = ('warning', "Base analytique SQL indisponible. Les données sont chargées en mémoire.")
+    return donnees, statut
+
+def charger_donnees():
+    """
+    Retourne les tables de la version courante des données
+    
+    Returns:
+        tuple: (patients_df, personnel_df, departements_df, quotidien_df)
+    """
+    return charger_tables(signature_donnees())[0]
+
+@st.cache_resource
+def modalites_patients(colonne, version):
+    """
+    Valeurs distinctes d'une colonne des patients, dans l'ordre d'apparition
+    
+    Args:
+        colonne: Colonne des patients (ex: 'traitement')
+        version: Signature des données (signature_donnees())
+    
+    Returns:
+        list: Les valeurs distinctes de la colonne
+    """
+    if sql_actif():
+        return executer_sql(f'SELECT "{colonne}" FROM patients GROUP BY "{colonne}" ORDER BY MIN(rowid)')[colonne].tolist()
+    return charger_donnees()[0][colonne].unique().tolist()
+
+# Charger les données
+donnees, statut_chargement = charger_tables(signature_donnees())
+if statut_chargement is not None:
+    niveau, message = statut_chargement
+    getattr(st, niveau)(message)
+patients_df, personnel_df, departements_df, quotidien_df = donnees
+
+# -----------------------------------------------------------------------------
+# BARRE LATÉRALE ET PARAMÈTRES
+# -----------------------------------------------------------------------------
+
+# Barre latérale
+# st.sidebar.image("https://img.icons8.com/color/96/000000/hospital-3.png", width=80)
+st.sidebar.title(t("sidebar_title"))
+st.sidebar.markdown(f"<div style='color: {current_theme['primary_color']}; margin-bottom: 20px; font-weight: 500;'>{t('sidebar_subtitle')}</div>", unsafe_allow_html=True)
+
+# Section des paramètres
+st.sidebar.markdown("---")
+st.sidebar.markdown(f"<div style='color: {current_theme['secondary_color']}; font-weight: 500;'>{t('settings')}</div>", unsafe_allow_html=True)
+
+# Sélection de la langue
+language_options = {"fr": "Français", "en": "English"}
+selected_language = st.sidebar.selectbox(
+    t("language"),
+    options=list(language_options.keys()),
+    format_func=lambda x: language_options[x],
+    index=list(language_options.keys()).index(st.session_state.language)
+)
+
+if selected_language != st.session_state.language:
+    st.session_state.language = selected_language
+    st.rerun()
+
+# Sélection du thème
+theme_options = {k: v["name"] for k, v in themes.items()}
+selected_theme = st.sidebar.selectbox(
+    t("theme"),
+    options=list(theme_options.keys()),
+    format_func=lambda x: theme_options[x],
+    index=list(theme_options.keys()).index(st.session_state.theme)
+)
+
+if selected_theme != st.session_state.theme:
+    st.session_state.theme = selected_theme
+    st.rerun()
+
+# Sélection de la devise
+currency_options = {"eur": t("eur"), "fcfa": t("fcfa")}
+selected_currency = st.sidebar.selectbox(
+    t("currency"),
+    options=list(currency_options.keys()),
+    format_func=lambda x: currency_options[x],
+    index=list(currency_options.keys()).index(st.session_state.currency)
+)
+
+if selected_currency != st.session_state.currency:
+    st.session_state.currency = selected_currency
+    st.rerun()
+
+# Option de mode compact
+compact_mode = st.sidebar.checkbox(
+    t("enable_compact"),
+    value=st.session_state.compact_mode
+)
+
+if compact_mode != st.session_state.compact_mode:
+    st.session_state.compact_mode = compact_mode
+    st.rerun()
+
+# Séparateur
+st.sidebar.markdown("---")
+
+# Filtres
+# Filtre de date
+min_date = quotidien_df['date'].min().date()
+max_date = quotidien_df['date'].max().date()
+plage_date = st.sidebar.date_input(
+    t("date_range"),
+    value=(min_date, max_date),
+    min_value=min_date,
+    max_value=max_date
+)
+
+# Filtre de département (None pour tous les départements)
+tous_departements = [None] + list(departements_df['departement'].unique())
+departement_selectionne = st.sidebar.selectbox(
+    t("department"),
+    tous_departements,
+    format_func=lambda departement: t("all_departments") if departement is None else t(departement)
+)
+
+# Filtres supplémentaires
+st.sidebar.markdown("---")
+st.sidebar.markdown(f"<div style='color: {current_theme['secondary_color']}; font-weight: 500;'>{t('advanced_filters')}</div>", unsafe_allow_html=True)
+filtre_traitement = st.sidebar.multiselect(
+    t("treatment_type"),
+    options=modalites_patients('traitement', signature_donnees()),
+    format_func=t,
+    default=[]
+)
+
+filtre_resultat = st.sidebar.multiselect(
+    t("patient_outcome"),
+    options=modalites_patients('resultat', signature_donnees()),
+    format_func=t,
+    default=[]
+)
+
+# -----------------------------------------------------------------------------
+# APPLICATION DES FILTRES
+# -----------------------------------------------------------------------------
+
+@st.cache_resource(max_entries=1)
+def indexer_donnees(version):
+    """
+    Construit une fois les index de positions des colonnes catégorielles d'une version des données
+    
+    Args:
+        version: Signature des données (signature_donnees())
+    
+    Returns:
+        dict: Table -> colonne -> catégorie -> positions des lignes
+    """
+    patients_df, personnel_df, _, _ = charger_donnees()
+    tables = {'patients': patients_df, 'personnel': personnel_df}
+    return {
+        nom: {colonne: construire_index_categories(tables[nom][colonne]) for colonne in colonnes}
+        for nom, colonnes in COLONNES_CATEGORIELLES.items()
+    }
+
+def positions_categories(index_colonne, valeurs):
+    """Positions triées des lignes appartenant à l'une des catégories retenues"""
+    parties = [index_colonne[valeur] for valeur in valeurs if valeur in index_colonne]
+    if not parties:
+        return np.empty(0, dtype=np.intp)
+    if len(parties) == 1:
+        return parties[0]
+    return np.sort(np.concatenate(parties))
+
+def intersecter_positions(selections, nombre_lignes):
+    """
+    Intersecte des tableaux triés de positions de lignes
+    
+    Part de la sélection la plus petite et ne conserve que les positions
+    présentes dans chacune des autres.
+    """
+    selections = sorted(selections, key=len)
+    positions = selections[0]
+    for autre in selections[1:]:
+        appartenance = np.zeros(nombre_lignes, dtype=bool)
+        appartenance[autre] = True
+        positions = positions[appartenance[positions]]
+    return positions
+
+# Nombre maximal de combinaisons de filtres conservées en cache (les moins récentes sont évincées)
+TAILLE_CACHE_FILTRES = 32
+
+@st.cache_resource(max_entries=TAILLE_CACHE_FILTRES)
+def filtrer_donnees(plage_date, departement, filtre_traitement, filtre_resultat, version):
+    """
+    Applique les filtres de la barre latérale, une seule fois par combinaison de filtres
+    
+    Les sélections sont partagées entre les réexécutions et les sessions :
+    changer de thème, de devise ou de mode d'affichage ne reparcourt pas les
+    tables. Elles ne doivent donc jamais être modifiées en place. Pour les
+    patients et le personnel, seules les positions des lignes retenues sont
+    conservées : les lignes ne sont extraites que page par page (voir lire_page).
+    
+    Args:
+        plage_date: Tuple (date_debut, date_fin), ou sélection incomplète
+        departement: Département sélectionné, None pour tous les départements
+        filtre_traitement: Tuple des traitements retenus (vide pour tous)
+        filtre_resultat: Tuple des résultats retenus (vide pour tous)
+        version: Signature des données (signature_donnees()), pour ne pas
+            resservir les vues d'une version précédente des fichiers
+    
+    Returns:
+        tuple: (lignes_patients, lignes_personnel, departements_filtre, quotidien_filtre,
+            periode) où lignes_patients et lignes_personnel sont les positions (int32)
+            des lignes retenues, None sans filtre ou avec le moteur SQL, et periode
+            le couple (premiere, derniere) des positions de quotidien_filtre dans
+            la table triée par date
+    """
+    patients_df, personnel_df, departements_df, quotidien_df = charger_donnees()
+    
+    # Appliquer le filtre de date (tranche contiguë de la table triée par date)
+    if len(plage_date) == 2:
+        premiere, derniere = bornes_periode(quotidien_df['date'], plage_date[0], plage_date[1])
+    else:
+        premiere, derniere = 0, len(quotidien_df)
+    quotidien_filtre = quotidien_df.iloc[premiere:derniere]
+    
+    if departement is not None:
+        departements_filtre = departements_df[departements_df['departement'] == departement]
+    else:
+        departements_filtre = departements_df
+    
+    # Moteur SQL : patients et personnel sont filtrés dans la base analytique (voir filtres_sql)
+    if sql_actif():
+        return None, None, departements_filtre, quotidien_filtre, (premiere, derniere)
+    
+    # Appliquer les filtres de département, de traitement et de résultat par intersection
+    # des positions précalculées, sans comparer les valeurs ligne par ligne
+    index = indexer_donnees(version)
+    selections_patients = [
+        positions_categories(index['patients'][colonne], valeurs)
+        for colonne, valeurs in (
+            ('departement', (departement,) if departement is not None else ()),
+            ('traitement', filtre_traitement),
+            ('resultat', filtre_resultat)
+        )
+        if valeurs
+    ]
+    lignes_patients = None
+    if selections_patients:
+        lignes_patients = intersecter_positions(selections_patients, len(patients_df)).astype(np.int32)
+    
+    lignes_personnel = None
+    if departement is not None:
+        lignes_personnel = positions_categories(index['personnel']['departement'], (departement,)).astype(np.int32)
+    
+    return lignes_patients, lignes_personnel, departements_filtre, quotidien_filtre, (premiere, derniere)
+
+if len(plage_date) == 2: 
+    date_debut, date_fin = plage_date
+else:
+    # Par défaut à la plage complète si plage_date n'est pas correctement définie
+    date_debut = min_date
+    date_fin = max_date
+
+# Appliquer les filtres (résultat mis en cache par combinaison de filtres)
+cle_filtres = (
+    tuple(plage_date),
+    departement_selectionne,
+    tuple(sorted(filtre_traitement)),
+    tuple(sorted(filtre_resultat)),
+    signature_donnees()
+)
+_, _, departements_filtre, quotidien_filtre, periode_quotidien = filtrer_donnees(*cle_filtres)
+
+# -----------------------------------------------------------------------------
+# CUMULS DES MÉTRIQUES QUOTIDIENNES
+# -----------------------------------------------------------------------------
+
+@st.cache_resource(max_entries=1)
+def construire_cumuls(version):
+    """
+    Construit une fois les sommes cumulées des métriques quotidiennes d'une version des données
+    
+    La table étant triée par date, la somme d'une métrique sur les lignes
+    [premiere, derniere) vaut cumuls[derniere] - cumuls[premiere] : toute
+    fenêtre se calcule en temps constant, sans trier ni parcourir la période.
+    
+    Args:
+        version: Signature des données (signature_donnees())
+    
+    Returns:
+        dict: Colonne -> tableau des sommes cumulées (longueur len(quotidien_df) + 1)
+    """
+    _, _, _, quotidien_df = charger_donnees()
+    return {
+        colonne: np.concatenate(([0], np.cumsum(quotidien_df[colonne].to_numpy())))
+        for colonne in quotidien_df.columns if colonne != 'date'
+    }
+
+def sommes_periode(periode, jours=None):
+    """
+    Sommes des métriques quotidiennes sur une période de la table triée par date
+    
+    Args:
+        periode: Couple (premiere, derniere) des positions renvoyé par filtrer_donnees
+        jours: Ne retenir que les derniers jours de la période (None pour toute la période)
+    
+    Returns:
+        dict: Colonne -> somme, ou None si la période compte moins de jours que demandé
+    """
+    premiere, derniere = periode
+    if jours is not None:
+        if derniere - premiere < jours:
+            return None
+        premiere = derniere - jours
+    return {colonne: cumul[derniere] - cumul[premiere] for colonne, cumul in construire_cumuls(signature_donnees()).items()}
+
+# -----------------------------------------------------------------------------
+# CUBES D'AGRÉGATS
+# -----------------------------------------------------------------------------
+
+# Dimensions des cubes : chaque axe compte une case de plus que de catégories, pour
+# les valeurs manquantes, retenue seulement quand la dimension n'est pas filtrée
+DIMENSIONS_CUBES = {
+    'patients': ['departement', 'traitement', 'resultat'],
+    'personnel': ['departement', 'role']
+}
+
+# Mesures des cubes : mesure -> (colonne, opération)
+MESURES_CUBES = {
+    'patients': {
+        'nombre': (None, 'lignes'),
+        'hospitalises': ('estHospitalise', 'vrais'),
+        'duree': ('dureeHospitalisation', 'somme'),
+        'durees': ('dureeHospitalisation', 'valeurs'),
+        'cout': ('coutTraitement', 'somme')
+    },
+    'personnel': {
+        'nombre': (None, 'lignes'),
+        'score': ('scorePerformance', 'somme'),
+        'scores': ('scorePerformance', 'valeurs')
+    }
+}
+
+# Expression SQL de chaque opération, pour construire un cube dans la base analytique
+EXPRESSIONS_MESURES_SQL = {
+    'lignes': 'COUNT(*)',
+    'vrais': 'SUM(CASE WHEN "{colonne}" THEN 1 ELSE 0 END)',
+    'somme': 'COALESCE(SUM("{colonne}"), 0)',
+    'valeurs': 'COUNT("{colonne}")'
+}
+
+def poids_lignes(df, mesures):
+    """
+    Contribution de chaque ligne d'une table aux mesures d'un cube
+    
+    Returns:
+        dict: Mesure -> tableau des poids (None pour un comptage de lignes)
+    """
+    poids = {}
+    for mesure, (colonne, operation) in mesures.items():
+        if operation == 'lignes':
+            poids[mesure] = None
+        elif operation == 'valeurs':
+            poids[mesure] = df[colonne].notna().to_numpy(dtype=np.float64)
+        else:
+            poids[mesure] = np.nan_to_num(df[colonne].to_numpy(dtype=np.float64))
+    return poids
+
+def grouper_sql(table, colonne_date=None):
+    """
+    Agrège une table de la base analytique selon les dimensions de son cube
+    
+    Seules les combinaisons présentes sont renvoyées, une ligne par
+    combinaison (et par jour si colonne_date est donnée).
+    
+    Returns:
+        DataFrame: Dimensions, colonne 'jour' éventuelle et une colonne par mesure
+    """
+    selection = [f'"{dimension}"' for dimension in DIMENSIONS_CUBES[table]]
+    if colonne_date is not None:
+        if base_analytique(signature_donnees())[0] is sqlite3:
+            selection.append(f'date("{colonne_date}") AS jour')
+        else:
+            selection.append(f'CAST("{colonne_date}" AS DATE) AS jour')
+    groupes = ', '.join(str(position) for position in range(1, len(selection) + 1))
+    selection += [
+        f'{EXPRESSIONS_MESURES_SQL[operation].format(colonne=colonne)} AS {mesure}'
+        for mesure, (colonne, operation) in MESURES_CUBES[table].items()
+    ]
+    return executer_sql(f"SELECT {', '.join(selection)} FROM {table} GROUP BY {groupes}")
+
+def codes_dimension(serie):
+    """
+    Position de chaque valeur sur l'axe d'une dimension
+    
+    Returns:
+        tuple: (codes, catégories), les valeurs manquantes prenant le code len(catégories)
+    """
+    categories = pd.Categorical(serie)
+    codes = categories.codes.astype(np.intp)
+    codes[codes < 0] = len(categories.categories)
+    return codes, categories.categories
+
+def codes_jours(dates):
+    """
+    Position de chaque date sur l'axe des jours
+    
+    Returns:
+        tuple: (codes, premier jour, nombre de jours), les dates manquantes
+        prenant le code nombre de jours
+    """
+    jours = pd.to_datetime(pd.Series(dates)).to_numpy().astype('datetime64[D]')
+    valides = ~np.isnat(jours)
+    if not valides.any():
+        return np.zeros(len(jours), dtype=np.intp), np.datetime64('today', 'D'), 0
+    premier_jour = jours[valides].min()
+    nombre_jours = int((jours[valides].max() - premier_jour).astype(np.int64)) + 1
+    codes = np.full(len(jours), nombre_jours, dtype=np.intp)
+    codes[valides] = (jours[valides] - premier_jour).astype(np.intp)
+    return codes, premier_jour, nombre_jours
+
+def remplir_cube(dimensions, poids, dates=None):
+    """
+    Matérialise un cube : la somme des poids de chaque combinaison de dimensions
+    
+    Args:
+        dimensions: Dimension -> Series des valeurs, une par ligne (ou par groupe)
+        poids: Mesure -> poids des lignes (None pour les compter)
+        dates: Dates des lignes, pour un dernier axe des jours (None pour ne pas en avoir)
+    
+    Returns:
+        dict: 'axes' (dimension -> catégories), 'premier_jour' et 'cellules'
+            (mesure -> tableau à une dimension par axe)
+    """
+    codes, axes = [], {}
+    for dimension, serie in dimensions.items():
+        codes_axe, axes[dimension] = codes_dimension(serie)
+        codes.append(codes_axe)
+    forme = [len(categories) + 1 for categories in axes.values()]
+    premier_jour = None
+    if dates is not None:
+        codes_axe, premier_jour, nombre_jours = codes_jours(dates)
+        codes.append(codes_axe)
+        forme.append(nombre_jours + 1)
+    
+    # Une seule passe par mesure : chaque ligne est ajoutée à la case de sa combinaison
+    cases = np.ravel_multi_index(codes, forme) if len(codes[0]) else np.empty(0, dtype=np.intp)
+    cellules = {
+        mesure: np.bincount(cases, weights=poids_mesure, minlength=int(np.prod(forme))).reshape(forme)
+        for mesure, poids_mesure in poids.items()
+    }
+    return {'axes': axes, 'premier_jour': premier_jour, 'cellules': cellules}
+
+@st.cache_resource(max_entries=1)
+def cube_patients(version):
+    """
+    Construit une fois le cube département × traitement × résultat × jour d'admission
+    
+    Le cube est construit à partir des patients en mémoire ou d'un GROUP BY
+    de la base analytique, et reconstruit pour chaque nouvelle version des
+    données. Quel que soit le nombre de patients, il ne compte qu'une case
+    par combinaison de catégories et par jour.
+    
+    Args:
+        version: Signature des données (signature_donnees())
+    
+    Returns:
+        dict: 'axes', 'premier_jour', 'cellules' (nombre d'admissions par case et
+            par jour), 'marges' (mesure -> cube sommé sur les jours) et
+            'admissions_cumulees' (admissions cumulées jour par jour)
+    """
+    mesures = MESURES_CUBES['patients']
+    if sql_actif():
+        groupes = grouper_sql('patients', 'dateAdmission')
+        poids = {mesure: groupes[mesure].to_numpy(dtype=np.float64) for mesure in mesures}
+        source, dates = groupes, groupes['jour']
+    else:
+        source = charger_donnees()[0]
+        poids, dates = poids_lignes(source, mesures), source['dateAdmission']
+    cube = remplir_cube({dimension: source[dimension] for dimension in DIMENSIONS_CUBES['patients']}, poids, dates)
+    
+    # La dernière case de l'axe des jours regroupe les dates d'admission manquantes
+    admissions = cube['cellules']['nombre'].sum(axis=(0, 1, 2))[:-1]
+    return {
+        'axes': cube['axes'],
+        'premier_jour': cube['premier_jour'],
+        'cellules': cube['cellules']['nombre'],
+        'marges': {mesure: cellules.sum(axis=-1) for mesure, cellules in cube['cellules'].items()},
+        'admissions_cumulees': np.concatenate(([0], np.cumsum(admissions)))
+    }
+
+@st.cache_resource(max_entries=1)
+def cube_personnel(version):
+    """
+    Construit une fois le cube département × rôle du personnel d'une version des données
+    
+    Args:
+        version: Signature des données (signature_donnees())
+    
+    Returns:
+        dict: 'axes' et 'marges' (mesure -> tableau département × rôle)
+    """
+    mesures = MESURES_CUBES['personnel']
+    if sql_actif():
+        source = grouper_sql('personnel')
+        poids = {mesure: source[mesure].to_numpy(dtype=np.float64) for mesure in mesures}
+    else:
+        source = charger_donnees()[1]
+        poids = poids_lignes(source, mesures)
+    cube = remplir_cube({dimension: source[dimension] for dimension in DIMENSIONS_CUBES['personnel']}, poids)
+    return {'axes': cube['axes'], 'marges': cube['cellules']}
+
+def masque_axe(categories, valeurs):
+    """Cases d'un axe retenues par un filtre : toutes, valeurs manquantes comprises, sans filtre"""
+    masque = np.ones(len(categories) + 1, dtype=bool)
+    if valeurs:
+        masque[-1] = False
+        masque[:-1] = categories.isin(valeurs)
+    return masque
+
+def sommer_par_categorie(cube, valeurs, dimension):
+    """
+    Somme les marges d'un cube sur les cases retenues, par catégorie d'une dimension
     
-    # Recommandations financières
-    alertes_financieres = [a for a in alertes if "financier" in a['titre'].lower() or "déficit" in a['titre'].lower()]
-    if alertes_financieres:
-        recommandations.append({
-            'titre': "Optimisation financière",
-            'message': "Revoir la structure des coûts et identifier les postes de dépenses à optimiser. Envisager une révision des tarifs pour certains services spécialisés."
-        })
+    Args:
+        cube: Cube de cube_patients ou cube_personnel
+        valeurs: Valeurs retenues par dimension (vide pour toutes)
+        dimension: Dimension conservée
+    
+    Returns:
+        dict: Mesure -> tableau des sommes par case de la dimension
+    """
+    masques = [masque_axe(categories, valeurs.get(nom, ())) for nom, categories in cube['axes'].items()]
+    position = list(cube['axes']).index(dimension)
+    masques[position] = np.ones_like(masques[position])
+    autres_axes = tuple(axe for axe in range(len(masques)) if axe != position)
+    # Les cases de la dimension conservée qui sortent du filtre sont mises à zéro
+    filtre_conserve = masque_axe(cube['axes'][dimension], valeurs.get(dimension, ()))
+    return {
+        mesure: marge[np.ix_(*masques)].sum(axis=autres_axes) * filtre_conserve
+        for mesure, marge in cube['marges'].items()
+    }
+
+def serie_par_categorie(sommes, categories, nom):
+    """Série des sommes des catégories présentes (la case des valeurs manquantes est exclue)"""
+    return pd.Series(sommes[:-1], index=pd.Index(categories, name=nom))
+
+def interroger_cube_patients(departement, filtre_traitement, filtre_resultat):
+    """
+    Agrégats des patients de la sélection, lus dans le cube
+    
+    Returns:
+        dict: Nombre de patients, patients hospitalisés, durée moyenne, revenu
+            total et nombre de patients par département (départements absents exclus)
+    """
+    cube = cube_patients(signature_donnees())
+    valeurs = {
+        'departement': (departement,) if departement is not None else (),
+        'traitement': filtre_traitement,
+        'resultat': filtre_resultat
+    }
+    sommes = sommer_par_categorie(cube, valeurs, 'departement')
+    totaux = {mesure: sommes_mesure.sum() for mesure, sommes_mesure in sommes.items()}
+    
+    repartition = serie_par_categorie(sommes['nombre'].astype(np.int64), cube['axes']['departement'], 'departement')
+    repartition = repartition[repartition > 0].sort_values(ascending=False, kind='stable')
+    return {
+        'total_patients': int(totaux['nombre']),
+        'patients_hospitalises': int(totaux['hospitalises']),
+        'duree_moyenne': totaux['duree'] / totaux['durees'] if totaux['durees'] else np.nan,
+        'revenu_total': totaux['cout'],
+        'repartition_departements': repartition
+    }
+
+def interroger_cube_personnel(departement):
+    """
+    Agrégats du personnel de la sélection, lus dans le cube
+    
+    Returns:
+        dict: Effectif total, effectif par rôle (rôles absents exclus) et score
+            de performance moyen par rôle
+    """
+    cube = cube_personnel(signature_donnees())
+    valeurs = {'departement': (departement,) if departement is not None else ()}
+    sommes = sommer_par_categorie(cube, valeurs, 'role')
+    roles = cube['axes']['role']
+    
+    effectifs = serie_par_categorie(sommes['nombre'].astype(np.int64), roles, 'role')
+    presents = effectifs > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        performance = serie_par_categorie(sommes['score'] / sommes['scores'], roles, 'role')
+    return {
+        'total_personnel': int(sommes['nombre'].sum()),
+        'effectifs_roles': effectifs[presents].sort_values(ascending=False, kind='stable'),
+        'performance_roles': performance[presents].rename('scorePerformance')
+    }
+
+# -----------------------------------------------------------------------------
+# INDICATEURS CLÉS
+# -----------------------------------------------------------------------------
+
+@st.cache_resource(max_entries=TAILLE_CACHE_FILTRES)
+def calculer_indicateurs(plage_date, departement, filtre_traitement, filtre_resultat, version):
+    """
+    Calcule une seule fois par combinaison de filtres les indicateurs affichés
+    
+    Cartes, graphiques, résumé et recommandations lisent tous ce même
+    résultat ; les agrégats des patients et du personnel sont lus dans les
+    cubes, sans parcourir les lignes.
+    
+    Args:
+        Mêmes arguments que filtrer_donnees
+    
+    Returns:
+        dict: Indicateurs de la sélection (agrégats des patients et du personnel,
+            taux moyens, capacité, sommes des métriques quotidiennes sur la période
+            et les 30 derniers jours)
+    """
+    _, _, departements, _, periode = filtrer_donnees(plage_date, departement, filtre_traitement, filtre_resultat, version)
+    _, _, departements_df, _ = charger_donnees()
+    
+    return {
+        **interroger_cube_patients(departement, filtre_traitement, filtre_resultat),
+        **interroger_cube_personnel(departement),
+        'taux_occupation_moyen': departements['tauxOccupation'].mean(),
+        'taux_retablissement_moyen': departements['tauxRetablissement'].mean(),
+        # Capacité de l'établissement entier, quel que soit le département sélectionné
+        'lits_disponibles': departements_df['litsDisponibles'].sum(),
+        'sommes_periode': sommes_periode(periode),
+        'sommes_30_jours': sommes_periode(periode, 30)
+    }
+
+def compter_admissions(debut, fin):
+    """
+    Nombre de patients admis entre deux dates (incluses), tous filtres confondus
+    
+    Returns:
+        int: Le nombre d'admissions de la période
+    """
+    # Différence des admissions cumulées du cube aux bornes de la période
+    cube = cube_patients(signature_donnees())
+    cumuls = cube['admissions_cumulees']
+    premiere, derniere = (
+        int(np.clip((np.datetime64(jour, 'D') - cube['premier_jour']).astype(np.int64) + decalage, 0, len(cumuls) - 1))
+        for jour, decalage in ((debut, 0), (fin, 1))
+    )
+    return int(max(0, cumuls[derniere] - cumuls[premiere]))
+
+# -----------------------------------------------------------------------------
+# REGISTRE DES RÈGLES D'ALERTE
+# -----------------------------------------------------------------------------
+
+# Fichier de configuration des règles d'alerte (seuils, messages)
+FICHIER_REGLES = './regles_alertes.json'
+
+# Fonctions NumPy utilisables dans les expressions des règles
+FONCTIONS_REGLES = {
+    'abs': np.abs,
+    'maximum': np.maximum,
+    'minimum': np.minimum,
+    'where': np.where,
+    'sqrt': np.sqrt,
+    'log': np.log
+}
+
+class FormateurAlerte(string.Formatter):
+    """
+    Formate les titres et messages des règles
+    
+    En plus des formats Python habituels (ex: {tauxOccupation:.1%}), accepte
+    'devise' pour un montant dans la devise de la session et 'entier' pour
+    une valeur tronquée (∞ si elle est infinie).
+    """
+    def format_field(self, value, format_spec):
+        if format_spec == 'devise':
+            return format_currency(value)
+        if format_spec == 'entier':
+            return str(int(value)) if np.isfinite(value) else '∞'
+        return super().format_field(value, format_spec)
+
+formateur_alerte = FormateurAlerte()
+
+def compiler_expression(expression, regle, nom):
+    """Compile une expression de règle une fois pour toutes"""
+    return compile(expression, f"<règle {regle}: {nom}>", 'eval')
+
+def compiler_regle(definition):
+    """
+    Compile une règle déclarative en prédicat vectorisé
+    
+    Args:
+        definition: Règle lue dans FICHIER_REGLES, avec notamment 'id', 'code'
+            (clé de RECOMMANDATIONS_PAR_CODE), 'table' ('departements' ou
+            'quotidien'), 'condition', 'titre' et 'message', et éventuellement
+            'variables' et 'fenetre' (nombre de jours)
+    
+    Returns:
+        dict: La règle avec ses expressions compilées
+    """
+    return {
+        'id': definition['id'],
+        'code': definition.get('code', definition['id']),
+        'table': definition['table'],
+        'fenetre': definition.get('fenetre'),
+        'variables': [
+            (nom, compiler_expression(expression, definition['id'], nom))
+            for nom, expression in definition.get('variables', {}).items()
+        ],
+        'condition': compiler_expression(definition['condition'], definition['id'], 'condition'),
+        'departement': definition.get('departement', 'Tous'),
+        'type': definition.get('type', 'avertissement'),
+        'titre': definition['titre'],
+        'message': definition['message']
+    }
+
+@st.cache_resource(max_entries=1)
+def charger_regles(version, chemin=FICHIER_REGLES):
+    """
+    Lit et compile les règles d'alerte une seule fois par version du fichier
+    
+    Args:
+        version: Signature du fichier des règles (voir signature_fichier), None s'il
+            n'existe pas : une modification des règles les recharge sans redémarrage
+        chemin: Fichier des règles
+    
+    Returns:
+        tuple: (règles compilées, statut) où statut vaut None ou (niveau, message) à afficher
+    """
+    try:
+        with open(chemin, encoding='utf-8') as f:
+            return [compiler_regle(definition) for definition in json.load(f)], None
+    except Exception as e:
+        return [], ('warning', f"Erreur lors du chargement des règles d'alerte ({chemin}): {e}")
+
+def evaluer_regle(regle, colonnes, longueur=None):
+    """
+    Évalue une règle compilée sur des colonnes (tableaux NumPy de même longueur)
+    
+    Args:
+        regle: Règle compilée
+        colonnes: Nom -> tableau (ou valeur scalaire)
+        longueur: Nombre de lignes ; les résultats scalaires (ex: une variable
+            constante) sont alors étendus à toutes les lignes
+    
+    Returns:
+        tuple: (masque des lignes qui déclenchent la règle, espace de noms de l'évaluation)
+    """
+    espace = dict(colonnes)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for nom, code in regle['variables']:
+            espace[nom] = eval(code, {'__builtins__': {}, **FONCTIONS_REGLES}, espace)
+        masque = eval(regle['condition'], {'__builtins__': {}, **FONCTIONS_REGLES}, espace)
+    masque = np.asarray(masque, dtype=bool)
+    if longueur is not None:
+        masque = np.broadcast_to(masque, (longueur,))
+        espace = {nom: np.broadcast_to(valeurs, (longueur,)) for nom, valeurs in espace.items()}
+    return masque, espace
+
+def evaluer_regles(regles, departements, periode):
+    """
+    Évalue toutes les règles et construit les alertes des lignes concernées
+    
+    Les règles 'departements' sont évaluées en une fois sur tout le tableau
+    des départements. Les règles 'quotidien' portent sur la somme des
+    'fenetre' derniers jours de la période (lue dans les cumuls précalculés)
+    et ne s'appliquent que si assez de jours sont disponibles.
+    
+    Une règle qui échoue à l'évaluation (nom de colonne mal orthographié,
+    message mal formé...) est ignorée et signalée, sans empêcher les autres
+    règles de s'appliquer.
+    
+    Returns:
+        tuple: (liste d'alertes, durée d'évaluation de chaque règle en ms,
+            liste des (code, erreur) des règles en échec)
+    """
+    colonnes_departements = {colonne: departements[colonne].to_numpy() for colonne in departements.columns}
+    # Noms des départements dans la langue de la session, pour les messages
+    colonnes_departements['departement'] = traduire(departements['departement']).to_numpy()
+    
+    declenchements = []
+    alertes_generales = []
+    durees = {}
+    erreurs = []
+    
+    for numero_regle, regle in enumerate(regles):
+        debut = time.perf_counter()
+        
+        try:
+            if regle['table'] == 'departements':
+                masque, espace = evaluer_regle(regle, colonnes_departements, len(departements))
+                # Alertes construites ici, pour qu'une erreur de message reste propre à la règle
+                declenchements.extend(
+                    (i, numero_regle, construire_alerte(regle, {nom: valeurs[i] for nom, valeurs in espace.items()},
+                                                        colonnes_departements['departement'][i]))
+                    for i in np.flatnonzero(masque)
+                )
+            else:
+                sommes = sommes_periode(periode, regle['fenetre'] or None)
+                if sommes is not None and periode[1] > periode[0]:
+                    masque, espace = evaluer_regle(regle, sommes)
+                    if masque.all():
+                        alertes_generales.append(construire_alerte(regle, espace, regle['departement']))
+        except Exception as e:
+            journal.warning("Règle d'alerte %s en échec: %s", regle['id'], e)
+            erreurs.append((regle['code'], e))
+        
+        durees[regle['id']] = (time.perf_counter() - debut) * 1000
+        journal.debug("Règle d'alerte %s évaluée en %.2f ms", regle['id'], durees[regle['id']])
+    
+    # Alertes des départements dans l'ordre des départements, puis des règles
+    alertes = [alerte for _, _, alerte in sorted(declenchements, key=lambda d: (d[0], d[1]))]
+    return alertes + alertes_generales, durees, erreurs
+
+def construire_alerte(regle, valeurs, departement):
+    """Construit l'alerte d'une règle déclenchée à partir des valeurs de la ligne concernée"""
+    return {
+        'code': regle['code'],
+        'titre': formateur_alerte.format(regle['titre'], **valeurs),
+        'message': formateur_alerte.format(regle['message'], **valeurs),
+        'departement': departement,
+        'type': regle['type']
+    }
+
+# -----------------------------------------------------------------------------
+# FONCTIONS D'ANALYSE ET DE GÉNÉRATION D'INSIGHTS
+# -----------------------------------------------------------------------------
+
+def generer_alertes(departements, periode):
+    """
+    Génère des alertes basées sur les données
+    
+    Args:
+        departements: DataFrame des départements
+        periode: Positions (premiere, derniere) de la période dans les métriques quotidiennes
+    
+    Returns:
+        list: Liste d'alertes avec code, titre, message, département et type
+    """
+    version_regles = signature_fichier(FICHIER_REGLES) if os.path.exists(FICHIER_REGLES) else None
+    regles, statut = charger_regles(version_regles)
+    if statut is not None:
+        niveau, message = statut
+        getattr(st, niveau)(message)
+    
+    # Seuils et messages définis dans FICHIER_REGLES ; les durées d'évaluation
+    # sont conservées pour repérer les règles coûteuses
+    alertes, st.session_state.durees_regles, erreurs = evaluer_regles(regles, departements, periode)
+    for code, erreur in erreurs:
+        st.warning(f"Règle d'alerte « {code} » ignorée : {erreur}")
+    return alertes
+
+# Recommandations associées aux codes d'alerte, dans l'ordre d'affichage
+# ({departements} est remplacé par la liste des départements concernés)
+RECOMMANDATIONS_PAR_CODE = {
+    'occupation': {
+        'titre': "Optimisation de la capacité d'accueil",
+        'message': "Envisager d'augmenter la capacité en lits dans les départements suivants : {departements}. Alternativement, mettre en place un système de transfert vers d'autres établissements pour les cas non urgents."
+    },
+    'retablissement': {
+        'titre': "Amélioration des taux de rétablissement",
+        'message': "Analyser les protocoles de traitement dans les départements suivants : {departements}. Envisager une révision des protocoles de soins et une formation supplémentaire du personnel."
+    },
+    'personnel': {
+        'titre': "Optimisation des ressources humaines",
+        'message': "Recruter du personnel supplémentaire ou réaffecter temporairement du personnel vers les départements suivants : {departements}. Envisager également des heures supplémentaires pour le personnel existant."
+    },
+    'financier': {
+        'titre': "Optimisation financière",
+        'message': "Revoir la structure des coûts et identifier les postes de dépenses à optimiser. Envisager une révision des tarifs pour certains services spécialisés."
+    }
+}
+
+def generer_recommandations(alertes, indicateurs):
+    """
+    Génère des recommandations basées sur les données et les alertes
+    
+    Args:
+        alertes: Liste des alertes générées
+        indicateurs: Indicateurs de la sélection (voir calculer_indicateurs)
+    
+    Returns:
+        list: Liste de recommandations avec titre et message
+    """
+    recommandations = []
+    
+    # Recommandations basées sur les alertes : un seul passage regroupe les
+    # départements concernés par code d'alerte
+    departements_par_code = {}
+    for alerte in alertes:
+        departements_par_code.setdefault(alerte['code'], []).append(alerte['departement'])
+    
+    for code, recommandation in RECOMMANDATIONS_PAR_CODE.items():
+        if code in departements_par_code:
+            recommandations.append({
+                'titre': recommandation['titre'],
+                'message': recommandation['message'].format(departements=', '.join(departements_par_code[code]))
+            })
     
     # Recommandations générales basées sur les données
     # Recommandation sur la durée d'hospitalisation
-    duree_moyenne = patients['dureeHospitalisation'].mean()
+    duree_moyenne = indicateurs['duree_moyenne']
     if duree_moyenne > 10:  # Si la durée moyenne est supérieure à 10 jours
         recommandations.append({
             'titre': "Réduction de la durée d'hospitalisation",
@@ -1086,26 +2692,26 @@ def generer_recommandations(departements, patients, personnel, alertes):
         })
     
     # Recommandation sur l'équilibre des départements
-    dept_counts = patients['departement'].value_counts()
+    # Les catégories absentes de la sélection sont ignorées
+    dept_counts = indicateurs['repartition_departements']
     if len(dept_counts) > 1:  # S'assurer qu'il y a au moins deux départements
         max_dept = dept_counts.idxmax()
         min_dept = dept_counts.idxmin()
         if dept_counts.max() > 3 * dept_counts.min():  # Si un département a 3 fois plus de patients qu'un autre
             recommandations.append({
                 'titre': "Rééquilibrage des ressources entre départements",
-                'message': f"Le département {max_dept} traite significativement plus de patients que le département {min_dept}. Envisager une redistribution des ressources et du personnel."
+                'message': f"Le département {t(max_dept)} traite significativement plus de patients que le département {t(min_dept)}. Envisager une redistribution des ressources et du personnel."
             })
     
     return recommandations
 
-def generer_resume(departements, patients, quotidien, alertes):
+def generer_resume(departements, indicateurs, alertes):
     """
     Génère un résumé des points importants basé sur les données
     
     Args:
         departements: DataFrame des départements
-        patients: DataFrame des patients
-        quotidien: DataFrame des métriques quotidiennes
+        indicateurs: Indicateurs de la sélection (voir calculer_indicateurs)
         alertes: Liste des alertes générées
     
     Returns:
@@ -1114,10 +2720,10 @@ def generer_resume(departements, patients, quotidien, alertes):
     resume = []
     
     # Statistiques générales
-    total_patients = len(patients)
-    patients_hospitalises = len(patients[patients['estHospitalise']])
-    taux_occupation_moyen = departements['tauxOccupation'].mean()
-    taux_retablissement_moyen = departements['tauxRetablissement'].mean()
+    total_patients = indicateurs['total_patients']
+    patients_hospitalises = indicateurs['patients_hospitalises']
+    taux_occupation_moyen = indicateurs['taux_occupation_moyen']
+    taux_retablissement_moyen = indicateurs['taux_retablissement_moyen']
     
     resume.append({
         'titre': "Vue d'ensemble",
@@ -1132,14 +2738,14 @@ def generer_resume(departements, patients, quotidien, alertes):
         
         resume.append({
             'titre': "Département le plus performant",
-            'message': f"Le département de {meilleur_dept['departement']} présente les meilleurs indicateurs avec un taux de rétablissement de {meilleur_dept['tauxRetablissement']*100:.1f}% et un taux d'occupation équilibré de {meilleur_dept['tauxOccupation']*100:.1f}%."
+            'message': f"Le département de {t(meilleur_dept['departement'])} présente les meilleurs indicateurs avec un taux de rétablissement de {meilleur_dept['tauxRetablissement']*100:.1f}% et un taux d'occupation équilibré de {meilleur_dept['tauxOccupation']*100:.1f}%."
         })
     
     # Tendances financières
-    if len(quotidien) >= 30:
-        dernier_mois = quotidien.sort_values('date').tail(30)
-        revenus_total = dernier_mois['revenus'].sum()
-        depenses_total = dernier_mois['depenses'].sum()
+    dernier_mois = indicateurs['sommes_30_jours']
+    if dernier_mois is not None:
+        revenus_total = dernier_mois['revenus']
+        depenses_total = dernier_mois['depenses']
         profit = revenus_total - depenses_total
         
         resume.append({
@@ -1163,10 +2769,530 @@ def generer_resume(departements, patients, quotidien, alertes):
 # GÉNÉRATION DES INSIGHTS
 # -----------------------------------------------------------------------------
 
+# Indicateurs clés (résultat mis en cache par combinaison de filtres)
+indicateurs = calculer_indicateurs(*cle_filtres)
+
 # Générer alertes, recommandations et résumé
-alertes = generer_alertes(departements_filtre, patients_filtre, quotidien_filtre)
-recommandations = generer_recommandations(departements_filtre, patients_filtre, personnel_filtre, alertes)
-resume = generer_resume(departements_filtre, patients_filtre, quotidien_filtre, alertes)
+alertes = generer_alertes(departements_filtre, periode_quotidien)
+recommandations = generer_recommandations(alertes, indicateurs)
+resume = generer_resume(departements_filtre, indicateurs, alertes)
+
+# -----------------------------------------------------------------------------
+# CONSTRUCTION DES GRAPHIQUES
+# -----------------------------------------------------------------------------
+
+def mise_en_page_theme(theme):
+    """Couleurs de fond, de texte et de grille communes aux graphiques du thème"""
+    return dict(
+        plot_bgcolor=theme["card_bg"],
+        paper_bgcolor=theme["card_bg"],
+        font=dict(color=theme["text_color"]),
+        xaxis=dict(gridcolor=theme["border_color"]),
+        yaxis=dict(gridcolor=theme["border_color"])
+    )
+
+# Nombre maximal de points par courbe des séries temporelles (de l'ordre de la
+# largeur en pixels d'un graphique) ; au-delà, les séries sont sous-échantillonnées
+POINTS_MAX_SERIE = 1000
+
+def positions_echantillon(series, points_max):
+    """
+    Positions des lignes à conserver pour tracer des séries longues
+    
+    Découpe les lignes en seaux contigus et garde, pour chaque série, la
+    position du minimum et du maximum de chaque seau, ainsi que la première
+    et la dernière ligne : les pics restent visibles quel que soit le
+    nombre de points supprimés.
+    
+    Args:
+        series: Liste de tableaux de valeurs de même longueur (une par courbe)
+        points_max: Nombre maximal de points par courbe
+    
+    Returns:
+        numpy.ndarray: Positions triées des lignes conservées
+    """
+    n = len(series[0])
+    if n == 0:
+        return np.arange(0)
+    # Jamais plus de seaux que de lignes : chaque seau contient au moins une ligne
+    nombre_seaux = max(1, min(n, (points_max - 2) // (2 * len(series))))
+    seaux = np.arange(n) * nombre_seaux // n
+    debuts = np.searchsorted(seaux, np.arange(nombre_seaux))
+    fins = np.append(debuts[1:], n) - 1
+    
+    positions = [np.array([0, n - 1])]
+    for valeurs in series:
+        # Tri par seau puis par valeur : le premier élément de chaque seau est
+        # son minimum, le dernier son maximum
+        ordre = np.lexsort((np.asarray(valeurs), seaux))
+        positions.extend((ordre[debuts], ordre[fins]))
+    return np.unique(np.concatenate(positions))
+
+def sous_echantillonner(df, series, points_max=POINTS_MAX_SERIE):
+    """
+    Réduit une table triée par date au nombre de points affichables
+    
+    La table est renvoyée telle quelle si elle compte au plus points_max
+    lignes, c'est-à-dire dès que la période sélectionnée est assez courte.
+    """
+    if len(df) <= points_max:
+        return df
+    return df.iloc[positions_echantillon(series, points_max)]
+
+# Infobulle des courbes et barres de montants : montant formaté dans la devise de la session
+INFOBULLE_MONTANT = '%{x}<br>%{hovertext}<extra>%{fullData.name}</extra>'
+
+def couleurs_roles(theme):
+    """Carte de couleurs des rôles du personnel"""
+    return {
+        t("doctor"): theme["primary_color"],
+        t("nurse"): theme["secondary_color"],
+        t("technician"): theme["accent_color"],
+        t("administrative"): theme["chart_colors"][3],
+        t("support"): theme["chart_colors"][4]
+    }
+
+def figure_admissions(cle_filtres, theme):
+    """Admissions et sorties quotidiennes"""
+    quotidien = filtrer_donnees(*cle_filtres)[3]
+    quotidien = sous_echantillonner(quotidien, [quotidien['nouvellesAdmissions'], quotidien['sorties']])
+    fig = px.line(quotidien, x='date', y=['nouvellesAdmissions', 'sorties'], 
+                 title=t("admissions_discharges"),
+                 labels={'value': t("count"), 'date': t("date"), 'variable': t("metric")},
+                 color_discrete_map={'nouvellesAdmissions': theme["primary_color"], 'sorties': theme["accent_color"]})
+    fig.update_layout(
+        legend_title_text='', 
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        **mise_en_page_theme(theme)
+    )
+    return fig
+
+def figure_repartition_departements(cle_filtres, theme):
+    """Distribution des patients par département"""
+    dept_counts = calculer_indicateurs(*cle_filtres)['repartition_departements'].reset_index()
+    dept_counts.columns = [t("department_label"), t("count")]
+    dept_counts[t("department_label")] = traduire(dept_counts[t("department_label")])
+    
+    # Créer une carte de couleurs pour les départements
+    dept_color_map = {dept: color for dept, color in zip(dept_counts[t("department_label")], theme["chart_colors"])}
+    
+    fig = px.pie(dept_counts, values=t("count"), names=t("department_label"), 
+                title=t("patient_distribution"),
+                color=t("department_label"),
+                color_discrete_map=dept_color_map)
+    fig.update_traces(textposition='inside', textinfo='percent+label', textfont=dict(color='#000000'))
+    fig.update_layout(
+        legend=dict(orientation="h", yanchor="bottom", y=-0.1, xanchor="center", x=0.5),
+        font=dict(color=theme["text_color"]),
+        paper_bgcolor=theme["card_bg"],
+        plot_bgcolor=theme["card_bg"]
+    )
+    return fig
+
+def figure_taux_departements(cle_filtres, theme, colonne, titre, libelle):
+    """Taux par département (occupation ou rétablissement)"""
+    departements = filtrer_donnees(*cle_filtres)[2]
+    departements = departements.assign(departement=traduire(departements['departement']))
+    fig = px.bar(departements, x='departement', y=colonne, 
+                title=t(titre),
+                labels={colonne: t(libelle), 'departement': t("department_label")},
+                color='departement',
+                color_discrete_map={dept: color for dept, color in zip(departements['departement'], theme["chart_colors"])})
+    fig.update_layout(
+        coloraxis_showscale=False,
+        showlegend=False,
+        **mise_en_page_theme(theme)
+    )
+    fig.update_yaxes(range=[0, 1], tickformat='.0%')
+    return fig
+
+def figure_occupation(cle_filtres, theme):
+    """Taux d'occupation par département"""
+    return figure_taux_departements(cle_filtres, theme, 'tauxOccupation', "bed_utilization", "bed_utilization_label")
+
+def figure_retablissement(cle_filtres, theme):
+    """Taux de rétablissement par département"""
+    return figure_taux_departements(cle_filtres, theme, 'tauxRetablissement', "recovery_rate", "recovery_rate_label")
+
+def figure_revenus_depenses(cle_filtres, theme):
+    """Revenus et dépenses quotidiens, avec la zone de profit"""
+    quotidien = filtrer_donnees(*cle_filtres)[3]
+    quotidien = sous_echantillonner(
+        quotidien, [quotidien['revenus'], quotidien['depenses'], quotidien['revenus'] - quotidien['depenses']]
+    )
+    fig = px.line(quotidien, x='date', y=['revenus', 'depenses'], 
+                 title=t("revenue_expenses"),
+                 labels={'value': t("amount"), 'date': t("date"), 'variable': t("metric")},
+                 color_discrete_map={'revenus': theme["success_color"], 'depenses': theme["danger_color"]})
+    
+    # Ajouter la zone de profit (sans modifier la vue filtrée partagée)
+    profit_quotidien = quotidien['revenus'] - quotidien['depenses']
+    fig.add_trace(go.Scatter(
+        x=quotidien['date'],
+        y=profit_quotidien,
+        fill='tozeroy',
+        mode='none',
+        name=t("profit"),
+        fillcolor=f'rgba({int(theme["success_color"][1:3], 16)}, {int(theme["success_color"][3:5], 16)}, {int(theme["success_color"][5:7], 16)}, 0.2)'
+    ))
+    
+    # Montants formatés dans les infobulles (courbes dans l'ordre de la figure)
+    for trace, montants in zip(fig.data, (quotidien['revenus'], quotidien['depenses'], profit_quotidien)):
+        trace.update(hovertext=format_currency_array(montants), hovertemplate=INFOBULLE_MONTANT)
+    
+    fig.update_layout(
+        legend_title_text='', 
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        **mise_en_page_theme(theme)
+    )
+    return fig
+
+def figure_revenus_couts(cle_filtres, theme):
+    """Revenus et coûts de fonctionnement par département"""
+    departements = filtrer_donnees(*cle_filtres)[2]
+    noms_departements = traduire(departements['departement'])
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=noms_departements,
+        y=departements['revenusTotal'],
+        name=t("revenue"),
+        marker_color=theme["success_color"],
+        hovertext=format_currency_array(departements['revenusTotal']),
+        hovertemplate=INFOBULLE_MONTANT
+    ))
+    
+    fig.add_trace(go.Bar(
+        x=noms_departements,
+        y=departements['coutFonctionnement'],
+        name=t("operating_cost"),
+        marker_color=theme["danger_color"],
+        hovertext=format_currency_array(departements['coutFonctionnement']),
+        hovertemplate=INFOBULLE_MONTANT
+    ))
+    
+    fig.update_layout(
+        title=t("department_revenue_cost"),
+        barmode='group',
+        xaxis_title=t("department_label"),
+        yaxis_title=t("amount"),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        **mise_en_page_theme(theme)
+    )
+    return fig
+
+def figure_personnel_roles(cle_filtres, theme):
+    """Distribution du personnel par rôle"""
+    role_counts = calculer_indicateurs(*cle_filtres)['effectifs_roles'].reset_index()
+    role_counts.columns = [t("role"), t("count")]
+    role_counts[t("role")] = traduire(role_counts[t("role")])
+    
+    fig = px.bar(role_counts, x=t("role"), y=t("count"), 
+                title=t("staff_distribution"),
+                color=t("role"),
+                color_discrete_map=couleurs_roles(theme))
+    fig.update_layout(
+        showlegend=False,
+        **mise_en_page_theme(theme)
+    )
+    return fig
+
+def figure_performance_roles(cle_filtres, theme):
+    """Score de performance moyen du personnel par rôle"""
+    performance_data = calculer_indicateurs(*cle_filtres)['performance_roles'].reset_index()
+    performance_data['role'] = traduire(performance_data['role'])
+    
+    fig = px.bar(performance_data, x='role', y='scorePerformance', 
+                title=t("performance_score"),
+                labels={'scorePerformance': t("performance_score"), 'role': t("role")},
+                color='role',
+                color_discrete_map=couleurs_roles(theme))
+    fig.update_layout(
+        showlegend=False,
+        **mise_en_page_theme(theme)
+    )
+    fig.update_yaxes(range=[0, 1])
+    return fig
+
+# Graphiques du tableau de bord, par identifiant
+GRAPHIQUES = {
+    'admissions': figure_admissions,
+    'repartition_departements': figure_repartition_departements,
+    'occupation': figure_occupation,
+    'retablissement': figure_retablissement,
+    'revenus_depenses': figure_revenus_depenses,
+    'revenus_couts': figure_revenus_couts,
+    'personnel_roles': figure_personnel_roles,
+    'performance_roles': figure_performance_roles
+}
+
+# Nombre maximal de figures conservées en cache (les moins récentes sont évincées)
+TAILLE_CACHE_GRAPHIQUES = 64
+
+@st.cache_resource(max_entries=TAILLE_CACHE_GRAPHIQUES)
+def construire_graphique(id_graphique, cle_filtres, nom_theme, langue, devise, compact=False):
+    """
+    Construit une figure une seule fois par graphique, filtres, thème, langue et devise
+    
+    La clé de filtres désigne une vue filtrée et des indicateurs eux-mêmes mis
+    en cache par filtrer_donnees et calculer_indicateurs : elle identifie les
+    données sans avoir à les hacher.
+    Les figures sont partagées entre les réexécutions et ne doivent pas être
+    modifiées après coup.
+    
+    Args:
+        id_graphique: Clé de GRAPHIQUES
+        cle_filtres: Arguments de filtrer_donnees
+        nom_theme: Clé du thème dans themes
+        langue: Langue des libellés (t() lit la langue de la session)
+        devise: Devise des montants des infobulles (lue dans la session)
+        compact: Hauteur et marges réduites pour le mode compact
+    
+    Returns:
+        Figure Plotly
+    """
+    theme = themes[nom_theme]
+    fig = GRAPHIQUES[id_graphique](cle_filtres, theme)
+    if compact:
+        fig.update_layout(height=250, margin=dict(l=10, r=10, t=40, b=10))
+    return fig
+
+def afficher_graphique(id_graphique, compact=False):
+    """Affiche un graphique du tableau de bord pour les filtres, le thème, la langue et la devise courants"""
+    fig = construire_graphique(id_graphique, cle_filtres, st.session_state.theme, st.session_state.language,
+                               devise_session, compact)
+    st.plotly_chart(fig, use_container_width=True)
+
+# -----------------------------------------------------------------------------
+# TABLEAUX DÉTAILLÉS
+# -----------------------------------------------------------------------------
+
+# Nombre de lignes envoyées au navigateur par page de tableau
+LIGNES_PAR_PAGE = 50
+
+# Position de chaque table dans le résultat de charger_donnees et de filtrer_donnees
+TABLES_DETAILLEES = {'patients': 0, 'personnel': 1, 'departements': 2}
+
+# Colonnes de montants, affichées dans la devise de la session
+COLONNES_MONETAIRES = ['coutTraitement', 'couvertureAssurance', 'salaire', 'revenusTotal', 'totalSalaires', 'coutFonctionnement']
+# Colonnes de clés de traduction, affichées dans la langue de la session
+COLONNES_TRADUITES = ['departement', 'traitement', 'resultat', 'role']
+
+def table_filtree(id_table, cle_filtres):
+    """
+    Table complète et positions des lignes retenues par les filtres
+    
+    Returns:
+        tuple: (table, lignes) où lignes vaut None si toutes les lignes de la table sont retenues
+    """
+    selection = filtrer_donnees(*cle_filtres)[TABLES_DETAILLEES[id_table]]
+    if isinstance(selection, pd.DataFrame):
+        return selection, None
+    return charger_donnees()[TABLES_DETAILLEES[id_table]], selection
+
+@st.cache_resource(max_entries=TAILLE_CACHE_FILTRES)
+def ordre_tri(id_table, cle_filtres, colonne, descendant):
+    """
+    Positions des lignes d'une table filtrée dans l'ordre de tri demandé
+    
+    Calculées une fois par table, filtres, colonne et sens : changer de page
+    ne retrie pas la table. Seule la colonne de tri est extraite.
+    """
+    table, lignes = table_filtree(id_table, cle_filtres)
+    serie = table[colonne] if lignes is None else table[colonne].iloc[lignes]
+    serie = serie.reset_index(drop=True)
+    return serie.sort_values(ascending=not descendant, kind='stable', na_position='last').index.to_numpy()
+
+def decrire_table(id_table, cle_filtres):
+    """
+    Colonnes et nombre de lignes d'une table filtrée
+    
+    Returns:
+        tuple: (liste des colonnes, nombre de lignes)
+    """
+    if sql_actif() and id_table in TABLES_SQL:
+        indicateurs_table = calculer_indicateurs(*cle_filtres)
+        return list(SOURCES_TABLES[id_table][1].values()), indicateurs_table[f'total_{id_table}']
+    table, lignes = table_filtree(id_table, cle_filtres)
+    return list(table.columns), len(table) if lignes is None else len(lignes)
+
+@st.cache_resource(max_entries=TAILLE_CACHE_FILTRES)
+def lire_page_sql(id_table, cle_filtres, colonnes, colonne_tri, descendant, debut, fin):
+    """
+    Lignes debut:fin d'une table filtrée et triée par la base analytique
+    
+    Seules les lignes de la page sont lues ; les dates et les booléens sont
+    retypés, SQLite les renvoyant en texte et en entiers.
+    """
+    clause, parametres = filtres_sql(id_table, *cle_filtres[1:4])
+    ordre = ORDRE_TABLES_SQL[id_table]
+    if colonne_tri is not None:
+        ordre = f'"{colonne_tri}" {"DESC" if descendant else "ASC"} NULLS LAST, {ordre}'
+    selection = ', '.join(f'"{colonne}"' for colonne in colonnes)
+    page = executer_sql(
+        f'SELECT {selection} FROM {id_table}{clause} ORDER BY {ordre} LIMIT ? OFFSET ?',
+        [*parametres, fin - debut, debut]
+    )
+    for colonne in page.columns:
+        if colonne in SOURCES_TABLES[id_table][2]:
+            page[colonne] = pd.to_datetime(page[colonne])
+        elif colonne in COLONNES_BOOLEENNES_SQL:
+            page[colonne] = page[colonne].astype(bool)
+    return page
+
+def lire_page(id_table, cle_filtres, colonnes, colonne_tri, descendant, debut, fin):
+    """
+    Lignes debut:fin d'une table filtrée, dans l'ordre de tri demandé
+    
+    Args:
+        id_table: Clé de TABLES_DETAILLEES
+        cle_filtres: Arguments de filtrer_donnees
+        colonnes: Colonnes à extraire
+        colonne_tri: Colonne de tri, None pour l'ordre de la table
+        descendant: Tri décroissant
+        debut, fin: Positions des lignes de la page
+    
+    Returns:
+        DataFrame: Les lignes et colonnes de la page
+    """
+    if sql_actif() and id_table in TABLES_SQL:
+        return lire_page_sql(id_table, cle_filtres, tuple(colonnes), colonne_tri, descendant, debut, fin)
+    table, lignes = table_filtree(id_table, cle_filtres)
+    if colonne_tri is not None:
+        page = ordre_tri(id_table, cle_filtres, colonne_tri, descendant)[debut:fin]
+    else:
+        page = slice(debut, fin)
+    if lignes is not None:
+        page = lignes[page]
+    return table.iloc[page, table.columns.get_indexer(colonnes)]
+
+def afficher_table(id_table, colonnes_exclues=()):
+    """
+    Affiche une table filtrée page par page
+    
+    Seules les lignes et les colonnes de la page visible sont extraites de la
+    vue filtrée et envoyées au navigateur ; le tri est fait côté serveur, sur
+    les montants bruts, qui ne sont formatés dans la devise qu'à l'affichage.
+    Avec le moteur SQL, la page des patients ou du personnel est lue dans la
+    base analytique.
+    
+    Args:
+        id_table: Clé de TABLES_DETAILLEES
+        colonnes_exclues: Colonnes jamais proposées à l'affichage
+    """
+    colonnes_table, nombre_lignes = decrire_table(id_table, cle_filtres)
+    colonnes = [colonne for colonne in colonnes_table if colonne not in colonnes_exclues]
+    nombre_pages = max(1, -(-nombre_lignes // LIGNES_PAR_PAGE))
+    
+    # Revenir à la dernière page si la sélection a rétréci depuis la réexécution précédente
+    cle_page = f"page_{id_table}"
+    if st.session_state.get(cle_page, 1) > nombre_pages:
+        st.session_state[cle_page] = nombre_pages
+    
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        colonnes_affichees = st.multiselect(t("columns"), colonnes, default=colonnes, key=f"colonnes_{id_table}")
+    with col2:
+        colonne_tri = st.selectbox(t("sort_by"), [None] + colonnes,
+                                   format_func=lambda colonne: t("no_sort") if colonne is None else colonne,
+                                   key=f"tri_{id_table}")
+    with col3:
+        descendant = st.checkbox(t("descending"), key=f"descendant_{id_table}")
+    with col4:
+        page = st.number_input(t("page"), min_value=1, max_value=nombre_pages, step=1, key=cle_page)
+    
+    debut = (page - 1) * LIGNES_PAR_PAGE
+    fin = min(debut + LIGNES_PAR_PAGE, nombre_lignes)
+    page_table = lire_page(id_table, cle_filtres, colonnes_affichees or colonnes, colonne_tri, descendant, debut, fin)
+    page_table = page_table.assign(**{
+        colonne: format_currency_array(page_table[colonne])
+        for colonne in COLONNES_MONETAIRES if colonne in page_table.columns
+    }, **{
+        colonne: traduire(page_table[colonne])
+        for colonne in COLONNES_TRADUITES if colonne in page_table.columns
+    }, **{
+        colonne: afficher_identifiants(page_table[colonne])
+        for colonne in PREFIXES_IDENTIFIANTS if colonne in page_table.columns
+    })
+    st.dataframe(page_table, use_container_width=True)
+    st.caption(t("rows_shown").format(debut=debut + 1 if fin else 0, fin=fin, total=nombre_lignes))
+
+# -----------------------------------------------------------------------------
+# CARTES
+# -----------------------------------------------------------------------------
+
+# Nombre de cartes affichées d'emblée dans chaque section (les suivantes à la demande)
+CARTES_PAR_SECTION = 12
+
+def carte_resume(item, position):
+    """Carte d'un point du résumé"""
+    return (f'<div class="summary-card">'
+            f'<div class="summary-title">{item["titre"]}</div>'
+            f'<div class="summary-message">{item["message"]}</div>'
+            f'</div>')
+
+def carte_alerte(alerte, position):
+    """Carte d'une alerte, mise en évidence si elle est critique"""
+    critique = ' alert-card-critical' if alerte['type'] == 'critique' else ''
+    return (f'<div class="alert-card{critique}">'
+            f'<div class="alert-title{critique.replace("card", "title")}">{alerte["titre"]}</div>'
+            f'<div class="alert-message{critique.replace("card", "message")}">{alerte["message"]}</div>'
+            f'</div>')
+
+def carte_recommandation(recommandation, position):
+    """Carte d'une recommandation"""
+    return (f'<div class="recommendation-card">'
+            f'<div class="recommendation-title">{recommandation["titre"]}</div>'
+            f'<div class="recommendation-message">{recommandation["message"]}</div>'
+            f'</div>')
+
+def carte_departement(dept, position, compacte=False):
+    """Carte d'un département, colorée selon sa colonne dans la grille (sans l'effectif en mode compact)"""
+    couleurs = current_theme["chart_colors"]
+    metriques = [
+        (t("patients"), dept['totalPatients']),
+        (t("bed_utilization_label"), f"{dept['tauxOccupation']*100:.1f}%"),
+        (t("recovery_rate_label"), f"{dept['tauxRetablissement']*100:.1f}%")
+    ]
+    if not compacte:
+        metriques.append((t("staff"), dept['nombrePersonnel']))
+    return (f'<div class="department-card" style="border-left: 4px solid {couleurs[position % 3 % len(couleurs)]}">'
+            f'<div class="department-title">{t(dept["departement"])}</div>'
+            + ''.join(f'<div class="department-metric">'
+                      f'<span class="department-metric-label">{libelle}:</span> '
+                      f'<span class="department-metric-value">{valeur}</span>'
+                      f'</div>' for libelle, valeur in metriques)
+            + '</div>')
+
+def afficher_plus(cle_nombre, nombre):
+    """Rappel du bouton « afficher plus » : élargit la section d'une tranche de cartes"""
+    st.session_state[cle_nombre] = nombre + CARTES_PAR_SECTION
+
+def afficher_cartes(cle, elements, rendre, classe_grille=None):
+    """
+    Affiche une section de cartes en un seul bloc HTML
+    
+    Seules les premières cartes sont construites et envoyées ; un bouton
+    ajoute les suivantes par tranches de CARTES_PAR_SECTION.
+    
+    Args:
+        cle: Identifiant de la section (mémorise le nombre de cartes affichées)
+        elements: Liste des éléments à afficher, dans l'ordre
+        rendre: Fonction (élément, position) -> HTML de la carte
+        classe_grille: Classe CSS du conteneur des cartes, le cas échéant
+    """
+    cle_nombre = f"cartes_{cle}"
+    nombre = st.session_state.get(cle_nombre, CARTES_PAR_SECTION)
+    
+    html = ''.join(rendre(element, position) for position, element in enumerate(elements[:nombre]))
+    if classe_grille:
+        html = f'<div class="{classe_grille}">{html}</div>'
+    st.markdown(html, unsafe_allow_html=True)
+    
+    restant = len(elements) - nombre
+    if restant > 0:
+        st.button(t("show_more").format(nombre=min(restant, CARTES_PAR_SECTION)), key=f"plus_{cle}",
+                  on_click=afficher_plus, args=(cle_nombre, nombre))
 
 # -----------------------------------------------------------------------------
 # AFFICHAGE DU TABLEAU DE BORD
@@ -1184,10 +3310,10 @@ if st.session_state.compact_mode:
     st.markdown('<div class="compact-grid">', unsafe_allow_html=True)
     
     # Métriques clés
-    total_patients = len(patients_filtre)
-    patients_actuels = len(patients_filtre[patients_filtre['estHospitalise']])
-    duree_moyenne = patients_filtre['dureeHospitalisation'].mean()
-    revenu_total = patients_filtre['coutTraitement'].sum()
+    total_patients = indicateurs['total_patients']
+    patients_actuels = indicateurs['patients_hospitalises']
+    duree_moyenne = indicateurs['duree_moyenne']
+    revenu_total = indicateurs['revenu_total']
     
     # Colonne 1: Métriques clés
     st.markdown(f"""
@@ -1228,8 +3354,8 @@ if st.session_state.compact_mode:
     
     # Colonne 4: Résumé financier
     if len(quotidien_filtre) > 0:
-        revenus_total = quotidien_filtre['revenus'].sum()
-        depenses_total = quotidien_filtre['depenses'].sum()
+        revenus_total = indicateurs['sommes_periode']['revenus']
+        depenses_total = indicateurs['sommes_periode']['depenses']
         profit = revenus_total - depenses_total
         profit_color = current_theme["success_color"] if profit >= 0 else current_theme["danger_color"]
         
@@ -1259,44 +3385,11 @@ if st.session_state.compact_mode:
     
     # Graphique 1: Admissions et sorties
     if len(quotidien_filtre) > 0:
-        fig = px.line(quotidien_filtre, x='date', y=['nouvellesAdmissions', 'sorties'], 
-                     title=t("admissions_discharges"),
-                     labels={'value': t("count"), 'date': t("date"), 'variable': t("metric")},
-                     color_discrete_map={'nouvellesAdmissions': current_theme["primary_color"], 'sorties': current_theme["accent_color"]})
-        fig.update_layout(
-            height=250,
-            legend_title_text='', 
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            plot_bgcolor=current_theme["card_bg"],
-            paper_bgcolor=current_theme["card_bg"],
-            font=dict(color=current_theme["text_color"]),
-            xaxis=dict(gridcolor=current_theme["border_color"]),
-            yaxis=dict(gridcolor=current_theme["border_color"]),
-            margin=dict(l=10, r=10, t=40, b=10)
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        afficher_graphique('admissions', compact=True)
     
     # Graphique 2: Taux d'occupation par département
     if not departements_filtre.empty:
-        fig = px.bar(departements_filtre, x='departement', y='tauxOccupation', 
-                    title=t("bed_utilization"),
-                    labels={'tauxOccupation': t("bed_utilization_label"), 'departement': t("department_label")},
-                    #color='departement  'departement': t("department_label")},
-                    color='departement',
-                    color_discrete_map={dept: color for dept, color in zip(departements_filtre['departement'], current_theme["chart_colors"])})
-        fig.update_layout(
-            height=250,
-            coloraxis_showscale=False,
-            plot_bgcolor=current_theme["card_bg"],
-            paper_bgcolor=current_theme["card_bg"],
-            font=dict(color=current_theme["text_color"]),
-            xaxis=dict(gridcolor=current_theme["border_color"]),
-            yaxis=dict(gridcolor=current_theme["border_color"]),
-            showlegend=False,
-            margin=dict(l=10, r=10, t=40, b=10)
-        )
-        fig.update_yaxes(range=[0, 1], tickformat='.0%')
-        st.plotly_chart(fig, use_container_width=True)
+        afficher_graphique('occupation', compact=True)
     
     # Fermer la grille
     st.markdown('</div>', unsafe_allow_html=True)
@@ -1307,30 +3400,9 @@ if st.session_state.compact_mode:
     
     # Créer une grille pour les départements
     if not departements_filtre.empty:
-        dept_data = departements_filtre.copy()
-        dept_data = dept_data.sort_values('totalPatients', ascending=False)
-        
-        cols = st.columns(min(3, len(dept_data)))
-        for i, dept in enumerate(dept_data.iterrows()):
-            dept = dept[1]  # Accéder aux données
-            with cols[i % 3]:
-                st.markdown(f"""
-                <div class="department-card" style="border-left: 4px solid {current_theme["chart_colors"][i % len(current_theme["chart_colors"])]}">
-                    <div class="department-title">{dept['departement']}</div>
-                    <div class="department-metric">
-                        <span class="department-metric-label">{t("patients")}:</span>
-                        <span class="department-metric-value">{dept['totalPatients']}</span>
-                    </div>
-                    <div class="department-metric">
-                        <span class="department-metric-label">{t("bed_utilization_label")}:</span>
-                        <span class="department-metric-value">{dept['tauxOccupation']*100:.1f}%</span>
-                    </div>
-                    <div class="department-metric">
-                        <span class="department-metric-label">{t("recovery_rate_label")}:</span>
-                        <span class="department-metric-value">{dept['tauxRetablissement']*100:.1f}%</span>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+        dept_data = departements_filtre.sort_values('totalPatients', ascending=False)
+        afficher_cartes('departements_compact', dept_data.to_dict('records'), partial(carte_departement, compacte=True),
+                        classe_grille='card-grid')
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -1340,13 +3412,7 @@ else:
     # Afficher le résumé en haut
     st.markdown(f'<div class="sub-header">{t("summary_section")}</div>', unsafe_allow_html=True)
     
-    for item in resume:
-        st.markdown(f"""
-        <div class="summary-card">
-            <div class="summary-title">{item['titre']}</div>
-            <div class="summary-message">{item['message']}</div>
-        </div>
-        """, unsafe_allow_html=True)
+    afficher_cartes('resume', resume, carte_resume)
     
     # Afficher les alertes
     if alertes:
@@ -1354,51 +3420,32 @@ else:
         
         # Trier les alertes par type (critiques d'abord)
         alertes_triees = sorted(alertes, key=lambda x: 0 if x['type'] == 'critique' else 1)
-        
-        for alerte in alertes_triees:
-            est_critique = alerte['type'] == 'critique'
-            st.markdown(f"""
-            <div class="alert-card {'alert-card-critical' if est_critique else ''}">
-                <div class="alert-title {'alert-title-critical' if est_critique else ''}">{alerte['titre']}</div>
-                <div class="alert-message {'alert-message-critical' if est_critique else ''}">{alerte['message']}</div>
-            </div>
-            """, unsafe_allow_html=True)
+        afficher_cartes('alertes', alertes_triees, carte_alerte)
     
     # Afficher les recommandations
     if recommandations:
         st.markdown(f'<div class="sub-header">{t("recommendations_section")}</div>', unsafe_allow_html=True)
         
-        for recommandation in recommandations:
-            st.markdown(f"""
-            <div class="recommendation-card">
-                <div class="recommendation-title">{recommandation['titre']}</div>
-                <div class="recommendation-message">{recommandation['message']}</div>
-            </div>
-            """, unsafe_allow_html=True)
+        afficher_cartes('recommandations', recommandations, carte_recommandation)
     
     # Métriques principales
     st.markdown(f'<div class="sub-header">{t("key_metrics_section")}</div>', unsafe_allow_html=True)
     
     col1, col2, col3, col4 = st.columns(4)
     
-    # Calculer les métriques
-    total_patients = len(patients_filtre)
-    patients_actuels = len(patients_filtre[patients_filtre['estHospitalise']])
-    duree_moyenne = patients_filtre['dureeHospitalisation'].mean()
-    revenu_total = patients_filtre['coutTraitement'].sum()
+    # Métriques de la sélection
+    total_patients = indicateurs['total_patients']
+    patients_actuels = indicateurs['patients_hospitalises']
+    duree_moyenne = indicateurs['duree_moyenne']
+    revenu_total = indicateurs['revenu_total']
     
     # Calculer les changements par rapport à la période précédente
     jours_periode_prec = (date_fin - date_debut).days
     debut_prec = date_debut - timedelta(days=jours_periode_prec)
     fin_prec = date_debut - timedelta(days=1)
     
-    # Convertir en datetime pour une comparaison correcte
-    debut_prec_dt = pd.Timestamp(debut_prec)
-    fin_prec_dt = pd.Timestamp(fin_prec)
-    
-    # Filtrer les patients pour la période précédente
-    patients_prec = len(patients_df[(patients_df['dateAdmission'] >= debut_prec_dt) & 
-                                   (patients_df['dateAdmission'] <= fin_prec_dt)])
+    # Compter les patients admis pendant la période précédente
+    patients_prec = compter_admissions(debut_prec, fin_prec)
     changement_patients = ((total_patients - patients_prec) / patients_prec * 100) if patients_prec > 0 else 0
     
     with col1:
@@ -1417,7 +3464,7 @@ else:
         <div class="metric-card">
             <div class="metric-label">{t("currently_admitted")}</div>
             <div class="metric-value">{patients_actuels:,}</div>
-            <div class="metric-label">{round(patients_actuels / departements_df['litsDisponibles'].sum() * 100, 1)}% {t("of_total_capacity")}</div>
+            <div class="metric-label">{round(patients_actuels / indicateurs['lits_disponibles'] * 100, 1)}% {t("of_total_capacity")}</div>
         </div>
         """, unsafe_allow_html=True)
     
@@ -1443,42 +3490,12 @@ else:
     
     with col1:
         # Admissions et sorties quotidiennes
-        fig = px.line(quotidien_filtre, x='date', y=['nouvellesAdmissions', 'sorties'], 
-                     title=t("admissions_discharges"),
-                     labels={'value': t("count"), 'date': t("date"), 'variable': t("metric")},
-                     color_discrete_map={'nouvellesAdmissions': current_theme["primary_color"], 'sorties': current_theme["accent_color"]})
-        fig.update_layout(
-            legend_title_text='', 
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            plot_bgcolor=current_theme["card_bg"],
-            paper_bgcolor=current_theme["card_bg"],
-            font=dict(color=current_theme["text_color"]),
-            xaxis=dict(gridcolor=current_theme["border_color"]),
-            yaxis=dict(gridcolor=current_theme["border_color"])
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        afficher_graphique('admissions')
     
     with col2:
         # Distribution par département
-        if not patients_filtre.empty:
-            dept_counts = patients_filtre['departement'].value_counts().reset_index()
-            dept_counts.columns = [t("department_label"), t("count")]
-            
-            # Créer une carte de couleurs pour les départements
-            dept_color_map = {dept: color for dept, color in zip(dept_counts[t("department_label")], current_theme["chart_colors"])}
-            
-            fig = px.pie(dept_counts, values=t("count"), names=t("department_label"), 
-                        title=t("patient_distribution"),
-                        color=t("department_label"),
-                        color_discrete_map=dept_color_map)
-            fig.update_traces(textposition='inside', textinfo='percent+label', textfont=dict(color='#000000'))
-            fig.update_layout(
-                legend=dict(orientation="h", yanchor="bottom", y=-0.1, xanchor="center", x=0.5),
-                font=dict(color=current_theme["text_color"]),
-                paper_bgcolor=current_theme["card_bg"],
-                plot_bgcolor=current_theme["card_bg"]
-            )
-            st.plotly_chart(fig, use_container_width=True)
+        if indicateurs['total_patients'] > 0:
+            afficher_graphique('repartition_departements')
     
     # Graphiques ligne 2
     st.markdown(f'<div class="sub-header">{t("department_performance_section")}</div>', unsafe_allow_html=True)
@@ -1487,42 +3504,12 @@ else:
     with col1:
         # Taux d'occupation par département
         if not departements_filtre.empty:
-            fig = px.bar(departements_filtre, x='departement', y='tauxOccupation', 
-                        title=t("bed_utilization"),
-                        labels={'tauxOccupation': t("bed_utilization_label"), 'departement': t("department_label")},
-                        color='departement',
-                        color_discrete_map={dept: color for dept, color in zip(departements_filtre['departement'], current_theme["chart_colors"])})
-            fig.update_layout(
-                coloraxis_showscale=False,
-                plot_bgcolor=current_theme["card_bg"],
-                paper_bgcolor=current_theme["card_bg"],
-                font=dict(color=current_theme["text_color"]),
-                xaxis=dict(gridcolor=current_theme["border_color"]),
-                yaxis=dict(gridcolor=current_theme["border_color"]),
-                showlegend=False
-            )
-            fig.update_yaxes(range=[0, 1], tickformat='.0%')
-            st.plotly_chart(fig, use_container_width=True)
+            afficher_graphique('occupation')
     
     with col2:
         # Taux de rétablissement par département
         if not departements_filtre.empty:
-            fig = px.bar(departements_filtre, x='departement', y='tauxRetablissement', 
-                        title=t("recovery_rate"),
-                        labels={'tauxRetablissement': t("recovery_rate_label"), 'departement': t("department_label")},
-                        color='departement',
-                        color_discrete_map={dept: color for dept, color in zip(departements_filtre['departement'], current_theme["chart_colors"])})
-            fig.update_layout(
-                coloraxis_showscale=False,
-                plot_bgcolor=current_theme["card_bg"],
-                paper_bgcolor=current_theme["card_bg"],
-                font=dict(color=current_theme["text_color"]),
-                xaxis=dict(gridcolor=current_theme["border_color"]),
-                yaxis=dict(gridcolor=current_theme["border_color"]),
-                showlegend=False
-            )
-            fig.update_yaxes(range=[0, 1], tickformat='.0%')
-            st.plotly_chart(fig, use_container_width=True)
+            afficher_graphique('retablissement')
     
     # Graphiques ligne 3
     st.markdown(f'<div class="sub-header">{t("financial_overview_section")}</div>', unsafe_allow_html=True)
@@ -1530,66 +3517,12 @@ else:
     
     with col1:
         # Revenus vs Dépenses
-        fig = px.line(quotidien_filtre, x='date', y=['revenus', 'depenses'], 
-                     title=t("revenue_expenses"),
-                     labels={'value': t("amount"), 'date': t("date"), 'variable': t("metric")},
-                     color_discrete_map={'revenus': current_theme["success_color"], 'depenses': current_theme["danger_color"]})
-        
-        # Ajouter la zone de profit
-        quotidien_filtre['profit'] = quotidien_filtre['revenus'] - quotidien_filtre['depenses']
-        fig.add_trace(go.Scatter(
-            x=quotidien_filtre['date'],
-            y=quotidien_filtre['profit'],
-            fill='tozeroy',
-            mode='none',
-            name=t("profit"),
-            fillcolor=f'rgba({int(current_theme["success_color"][1:3], 16)}, {int(current_theme["success_color"][3:5], 16)}, {int(current_theme["success_color"][5:7], 16)}, 0.2)'
-        ))
-        
-        fig.update_layout(
-            legend_title_text='', 
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            plot_bgcolor=current_theme["card_bg"],
-            paper_bgcolor=current_theme["card_bg"],
-            font=dict(color=current_theme["text_color"]),
-            xaxis=dict(gridcolor=current_theme["border_color"]),
-            yaxis=dict(gridcolor=current_theme["border_color"])
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        afficher_graphique('revenus_depenses')
     
     with col2:
         # Revenus et coûts par département
         if not departements_filtre.empty:
-            fig = go.Figure()
-            
-            fig.add_trace(go.Bar(
-                x=departements_filtre['departement'],
-                y=departements_filtre['revenusTotal'],
-                name=t("revenue"),
-                marker_color=current_theme["success_color"]
-            ))
-            
-            fig.add_trace(go.Bar(
-                x=departements_filtre['departement'],
-                y=departements_filtre['coutFonctionnement'],
-                name=t("operating_cost"),
-                marker_color=current_theme["danger_color"]
-            ))
-            
-            fig.update_layout(
-                title=t("department_revenue_cost"),
-                barmode='group',
-                xaxis_title=t("department_label"),
-                yaxis_title=t("amount"),
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-                plot_bgcolor=current_theme["card_bg"],
-                paper_bgcolor=current_theme["card_bg"],
-                font=dict(color=current_theme["text_color"]),
-                xaxis=dict(gridcolor=current_theme["border_color"]),
-                yaxis=dict(gridcolor=current_theme["border_color"])
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            afficher_graphique('revenus_couts')
     
     # Section du personnel
     st.markdown(f'<div class="sub-header">{t("staff_overview_section")}</div>', unsafe_allow_html=True)
@@ -1597,90 +3530,21 @@ else:
     
     with col1:
         # Distribution du personnel par rôle
-        if not personnel_filtre.empty:
-            role_counts = personnel_filtre['role'].value_counts().reset_index()
-            role_counts.columns = [t("role"), t("count")]
-            
-            # Créer une carte de couleurs pour les rôles
-            role_colors = {
-                t("doctor"): current_theme["primary_color"],
-                t("nurse"): current_theme["secondary_color"],
-                t("technician"): current_theme["accent_color"],
-                t("administrative"): current_theme["chart_colors"][3],
-                t("support"): current_theme["chart_colors"][4]
-            }
-            
-            fig = px.bar(role_counts, x=t("role"), y=t("count"), 
-                        title=t("staff_distribution"),
-                        color=t("role"),
-                        color_discrete_map=role_colors)
-            fig.update_layout(
-                showlegend=False,
-                plot_bgcolor=current_theme["card_bg"],
-                paper_bgcolor=current_theme["card_bg"],
-                font=dict(color=current_theme["text_color"]),
-                xaxis=dict(gridcolor=current_theme["border_color"]),
-                yaxis=dict(gridcolor=current_theme["border_color"])
-            )
-            st.plotly_chart(fig, use_container_width=True)
+        if indicateurs['total_personnel'] > 0:
+            afficher_graphique('personnel_roles')
     
     with col2:
         # Performance du personnel
-        if not personnel_filtre.empty:
-            performance_data = personnel_filtre.groupby('role')['scorePerformance'].mean().reset_index()
-            
-            fig = px.bar(performance_data, x='role', y='scorePerformance', 
-                        title=t("performance_score"),
-                        labels={'scorePerformance': t("performance_score"), 'role': t("role")},
-                        color='role',
-                        color_discrete_map=role_colors)
-            fig.update_layout(
-                showlegend=False,
-                plot_bgcolor=current_theme["card_bg"],
-                paper_bgcolor=current_theme["card_bg"],
-                font=dict(color=current_theme["text_color"]),
-                xaxis=dict(gridcolor=current_theme["border_color"]),
-                yaxis=dict(gridcolor=current_theme["border_color"])
-            )
-            fig.update_yaxes(range=[0, 1])
-            st.plotly_chart(fig, use_container_width=True)
+        if indicateurs['total_personnel'] > 0:
+            afficher_graphique('performance_roles')
     
     # Cartes des départements
     st.markdown(f'<div class="sub-header">{t("department_quick_view_section")}</div>', unsafe_allow_html=True)
     
     # Créer des cartes de département en rangées de 3
     if not departements_filtre.empty:
-        dept_data = departements_filtre.copy()
-        dept_data = dept_data.sort_values('totalPatients', ascending=False)
-        
-        # Créer des rangées de 3 cartes
-        for i in range(0, len(dept_data), 3):
-            cols = st.columns(3)
-            for j in range(3):
-                if i+j < len(dept_data):
-                    dept = dept_data.iloc[i+j]
-                    with cols[j]:
-                        st.markdown(f"""
-                        <div class="department-card" style="border-left: 4px solid {current_theme["chart_colors"][j % len(current_theme["chart_colors"])]}">
-                            <div class="department-title">{dept['departement']}</div>
-                            <div class="department-metric">
-                                <span class="department-metric-label">{t("patients")}:</span>
-                                <span class="department-metric-value">{dept['totalPatients']}</span>
-                            </div>
-                            <div class="department-metric">
-                                <span class="department-metric-label">{t("bed_utilization_label")}:</span>
-                                <span class="department-metric-value">{dept['tauxOccupation']*100:.1f}%</span>
-                            </div>
-                            <div class="department-metric">
-                                <span class="department-metric-label">{t("recovery_rate_label")}:</span>
-                                <span class="department-metric-value">{dept['tauxRetablissement']*100:.1f}%</span>
-                            </div>
-                            <div class="department-metric">
-                                <span class="department-metric-label">{t("staff")}:</span>
-                                <span class="department-metric-value">{dept['nombrePersonnel']}</span>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
+        dept_data = departements_filtre.sort_values('totalPatients', ascending=False)
+        afficher_cartes('departements', dept_data.to_dict('records'), carte_departement, classe_grille='card-grid')
     
     # Tableaux détaillés
     st.markdown(f'<div class="sub-header">{t("detailed_data_section")}</div>', unsafe_allow_html=True)
@@ -1688,13 +3552,13 @@ else:
     tab1, tab2, tab3 = st.tabs([t("patient_data"), t("department_data"), t("staff_data")])
     
     with tab1:
-        st.dataframe(patients_filtre.drop(['estHospitalise'], axis=1), use_container_width=True)
+        afficher_table('patients', colonnes_exclues=('estHospitalise',))
     
     with tab2:
-        st.dataframe(departements_filtre, use_container_width=True)
+        afficher_table('departements')
     
     with tab3:
-        st.dataframe(personnel_filtre, use_container_width=True)
+        afficher_table('personnel')
 
 # Pied de page
 st.markdown("---")
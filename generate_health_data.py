@@ -1,8 +1,11 @@
+import argparse
+import glob
 import json
 import os
 import random
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 
 # Generate random date within range
@@ -16,14 +19,31 @@ def random_date(start, end):
 def format_date(date):
     return date.strftime('%Y-%m-%d')
 
+# Patient categories, shared by the scalar and the vectorized generators
+PATIENT_DEPARTMENTS = ['Cardiology', 'Neurology', 'Oncology', 'Pediatrics', 'Emergency', 'Surgery']
+TREATMENTS = ['Medication', 'Surgery', 'Therapy', 'Observation', 'Intensive Care']
+OUTCOMES = ['Recovered', 'Improved', 'Stable', 'Deteriorated', 'Deceased']
+OUTCOME_WEIGHTS = [0.6, 0.2, 0.1, 0.07, 0.03]  # Probability weights
+GENDERS = ['Male', 'Female']
+
+# Daily base cost by department
+BASE_COSTS = {
+    'Cardiology': 1500,
+    'Neurology': 1800,
+    'Oncology': 2200,
+    'Pediatrics': 1000,
+    'Emergency': 2000,
+    'Surgery': 3000
+}
+
 # Generate patient data
 def generate_patient_data(days=90):
     patients = []
     now = datetime.now()
-    departments = ['Cardiology', 'Neurology', 'Oncology', 'Pediatrics', 'Emergency', 'Surgery']
-    treatments = ['Medication', 'Surgery', 'Therapy', 'Observation', 'Intensive Care']
-    outcomes = ['Recovered', 'Improved', 'Stable', 'Deteriorated', 'Deceased']
-    outcome_weights = [0.6, 0.2, 0.1, 0.07, 0.03]  # Probability weights
+    departments = PATIENT_DEPARTMENTS
+    treatments = TREATMENTS
+    outcomes = OUTCOMES
+    outcome_weights = OUTCOME_WEIGHTS
 
     for i in range(1000):
         admission_date = random_date(now - timedelta(days=days), now)
@@ -43,14 +63,7 @@ def generate_patient_data(days=90):
             outcome = random.choices(outcomes, weights=outcome_weights)[0]
         
         # Generate costs based on department and treatment
-        base_cost = {
-            'Cardiology': 1500,
-            'Neurology': 1800,
-            'Oncology': 2200,
-            'Pediatrics': 1000,
-            'Emergency': 2000,
-            'Surgery': 3000
-        }.get(department, 1200)
+        base_cost = BASE_COSTS.get(department, 1200)
         
         if treatment == 'Surgery':
             base_cost += 5000
@@ -62,7 +75,7 @@ def generate_patient_data(days=90):
         patients.append({
             'patientId': f'P{1000 + i}',
             'age': random.randint(1, 95),
-            'gender': random.choice(['Male', 'Female']),
+            'gender': random.choice(GENDERS),
             'department': department,
             'admissionDate': format_date(admission_date),
             'dischargeDate': None if is_admitted else format_date(discharge_date),
@@ -76,6 +89,103 @@ def generate_patient_data(days=90):
     
     return patients
 
+# Generate patient data as a columnar DataFrame, in NumPy batches instead of one dict per row.
+# Same distributions and outcome weights as generate_patient_data, for load-test sized datasets.
+def generate_patient_frame(n_patients=1000, days=90, seed=None, now=None, first_id=1000):
+    rng = np.random.default_rng(seed)
+    now = np.datetime64(datetime.now() if now is None else now, 'us')
+    
+    # Admission uniformly drawn, to the second, within the last `days` days
+    offsets = rng.integers(0, days * 24 * 60 * 60, n_patients).astype('timedelta64[s]')
+    admission_dates = now - np.timedelta64(days, 'D') + offsets
+    stay_durations = rng.integers(1, 31, n_patients)
+    discharge_dates = admission_dates + stay_durations.astype('timedelta64[D]')
+    
+    # Determine if patient is still admitted
+    is_admitted = discharge_dates > now
+    
+    departments = rng.integers(0, len(PATIENT_DEPARTMENTS), n_patients)
+    treatments = rng.integers(0, len(TREATMENTS), n_patients)
+    
+    # Weighted random outcome selection, 'In Treatment' is the last category
+    outcomes = rng.choice(len(OUTCOMES), n_patients, p=OUTCOME_WEIGHTS)
+    outcomes[is_admitted] = len(OUTCOMES)
+    
+    # Generate costs based on department and treatment
+    base_costs = np.array([BASE_COSTS[d] for d in PATIENT_DEPARTMENTS])[departments]
+    base_costs += np.where(treatments == TREATMENTS.index('Surgery'), 5000, 0)
+    base_costs += np.where(treatments == TREATMENTS.index('Intensive Care'), 3000, 0)
+    treatment_costs = base_costs * (0.8 + rng.random(n_patients) * 0.4) * stay_durations
+    insurance_covered = treatment_costs * (0.7 + rng.random(n_patients) * 0.25)
+    
+    elapsed_days = (now - admission_dates) // np.timedelta64(1, 'D')
+    
+    # Dates span a few hundred distinct days: store them as categoricals of 'YYYY-MM-DD'
+    # strings instead of one string per row (missing discharge dates get code -1).
+    # The calendar starts with the sampling window, so it is defined even for an empty shard.
+    first_day = (now - np.timedelta64(days, 'D')).astype('datetime64[D]')
+    day_strings = np.datetime_as_string(np.arange(first_day, now.astype('datetime64[D]') + 32), unit='D')
+    admission_days = (admission_dates.astype('datetime64[D]') - first_day).astype(np.int64)
+    discharge_days = np.where(is_admitted, -1, admission_days + stay_durations)
+    
+    last_id = first_id + n_patients
+    patient_ids = np.char.add('P', np.arange(first_id, last_id).astype(f'U{len(str(last_id))}'))
+    
+    return pd.DataFrame({
+        'patientId': patient_ids,
+        'age': rng.integers(1, 96, n_patients),
+        'gender': pd.Categorical.from_codes(rng.integers(0, len(GENDERS), n_patients), GENDERS),
+        'department': pd.Categorical.from_codes(departments, PATIENT_DEPARTMENTS),
+        'admissionDate': pd.Categorical.from_codes(admission_days, day_strings),
+        'dischargeDate': pd.Categorical.from_codes(discharge_days, day_strings),
+        'stayDuration': np.where(is_admitted, elapsed_days, stay_durations),
+        'treatment': pd.Categorical.from_codes(treatments, TREATMENTS),
+        'outcome': pd.Categorical.from_codes(outcomes, OUTCOMES + ['In Treatment']),
+        'treatmentCost': np.rint(treatment_costs).astype(np.int64),
+        'insuranceCovered': np.rint(insurance_covered).astype(np.int64),
+        'isAdmitted': is_admitted
+    })
+
+# Staff categories and base salary by role, used by the vectorized staff generator
+STAFF_DEPARTMENTS = PATIENT_DEPARTMENTS + ['Administration']
+ROLES = ['Doctor', 'Nurse', 'Technician', 'Administrative', 'Support']
+BASE_SALARIES = {
+    'Doctor': 120000,
+    'Nurse': 70000,
+    'Technician': 60000,
+    'Administrative': 50000,
+    'Support': 40000
+}
+
+# Generate staff data as a columnar DataFrame, with the same distributions as generate_staff_data
+def generate_staff_frame(n_staff=200, seed=None, first_id=1000):
+    rng = np.random.default_rng(seed)
+    
+    departments = rng.integers(0, len(STAFF_DEPARTMENTS), n_staff)
+    roles = rng.integers(0, len(ROLES), n_staff)
+    
+    # Base salary by role, adjusted by department
+    base_salaries = np.array([BASE_SALARIES[r] for r in ROLES], dtype=np.float64)[roles]
+    premium = np.isin(departments, [STAFF_DEPARTMENTS.index('Surgery'), STAFF_DEPARTMENTS.index('Cardiology')])
+    base_salaries[premium] *= 1.2
+    
+    # Salary increases with years of service
+    years_of_service = rng.integers(0, 31, n_staff)
+    salaries = np.rint(base_salaries * (1 + years_of_service * 0.02)).astype(np.int64)
+    
+    treats_patients = np.isin(roles, [ROLES.index('Doctor'), ROLES.index('Nurse')])
+    last_id = first_id + n_staff
+    
+    return pd.DataFrame({
+        'staffId': np.char.add('S', np.arange(first_id, last_id).astype(f'U{len(str(last_id))}')),
+        'department': pd.Categorical.from_codes(departments, STAFF_DEPARTMENTS),
+        'role': pd.Categorical.from_codes(roles, ROLES),
+        'yearsOfService': years_of_service,
+        'salary': salaries,
+        'patientsHandled': np.where(treats_patients, rng.integers(10, 101, n_staff), 0),
+        'performanceScore': np.round(rng.uniform(70, 100, n_staff) / 100, 2)
+    })
+
 # Generate staff data
 def generate_staff_data():
     departments = ['Cardiology', 'Neurology', 'Oncology', 'Pediatrics', 'Emergency', 'Surgery', 'Administration']
@@ -115,64 +225,96 @@ def generate_staff_data():
     
     return staff
 
-# Generate department performance data
-def generate_department_data(patient_data, staff_data):
-    departments = ['Cardiology', 'Neurology', 'Oncology', 'Pediatrics', 'Emergency', 'Surgery']
+# Beds available by department (departments not listed have no beds)
+BEDS_AVAILABLE = {
+    'Cardiology': 50,
+    'Neurology': 40,
+    'Oncology': 60,
+    'Pediatrics': 45,
+    'Emergency': 30,
+    'Surgery': 35
+}
+
+# Departments reported, in order: every department with beds, then any other
+# department that has patients (staff-only services such as Administration are left out)
+def reindex_departments(partials):
+    extra = [dept for dept in partials.index if dept not in BEDS_AVAILABLE and partials.at[dept, 'totalPatients'] > 0]
+    return partials.reindex(list(BEDS_AVAILABLE) + extra).fillna(0).astype(np.int64)
+
+# Per-department sums and counts over patients and staff, in one groupby pass each.
+# The partials are additive: shards can be aggregated separately and summed.
+def aggregate_department_partials(patient_data, staff_data):
+    patients = pd.DataFrame(patient_data)
+    staff = pd.DataFrame(staff_data)
+    
+    discharged = ~patients['isAdmitted'].astype(bool)
+    patient_sums = patients.assign(
+        discharged=discharged,
+        recovered=discharged & patients['outcome'].isin(['Recovered', 'Improved'])
+    ).groupby('department', observed=True).agg(
+        totalPatients=('isAdmitted', 'size'),
+        stayDurationSum=('stayDuration', 'sum'),
+        totalRevenue=('treatmentCost', 'sum'),
+        discharged=('discharged', 'sum'),
+        recovered=('recovered', 'sum'),
+        currentlyAdmitted=('isAdmitted', 'sum')
+    )
+    
+    staff_sums = staff.assign(
+        doctor=staff['role'] == 'Doctor',
+        nurse=staff['role'] == 'Nurse'
+    ).groupby('department', observed=True).agg(
+        totalSalaries=('salary', 'sum'),
+        staffCount=('salary', 'size'),
+        doctorCount=('doctor', 'sum'),
+        nurseCount=('nurse', 'sum')
+    )
+    
+    partials = patient_sums.join(staff_sums, how='outer')
+    partials.index = partials.index.astype(str)
+    return reindex_departments(partials.fillna(0))
+
+# Sum partial aggregates computed on separate shards, over the union of their departments
+def merge_department_partials(partials):
+    return reindex_departments(pd.concat(partials).groupby(level=0, sort=False).sum())
+
+# Turn department partials into the department performance records
+def finalize_department_data(partials):
     department_data = []
     
-    for dept in departments:
-        dept_patients = [p for p in patient_data if p['department'] == dept]
-        dept_staff = [s for s in staff_data if s['department'] == dept]
-        
-        total_patients = len(dept_patients)
-        if total_patients > 0:
-            avg_stay_duration = sum(p['stayDuration'] for p in dept_patients) / total_patients
-        else:
-            avg_stay_duration = 0
-            
-        total_revenue = sum(p['treatmentCost'] for p in dept_patients)
-        total_salaries = sum(s['salary'] for s in dept_staff)
-        
-        # Calculate recovery rate
-        non_admitted = [p for p in dept_patients if not p['isAdmitted']]
-        recovered_patients = len([p for p in non_admitted if p['outcome'] in ['Recovered', 'Improved']])
-        recovery_rate = recovered_patients / len(non_admitted) if len(non_admitted) > 0 else 0
-        
-        # Calculate bed utilization
-        beds_available = {
-            'Cardiology': 50,
-            'Neurology': 40,
-            'Oncology': 60,
-            'Pediatrics': 45,
-            'Emergency': 30,
-            'Surgery': 35
-        }[dept]
-        
-        currently_admitted = len([p for p in dept_patients if p['isAdmitted']])
-        bed_utilization = currently_admitted / beds_available
+    for dept, row in partials.iterrows():
+        total_patients = int(row['totalPatients'])
+        avg_stay_duration = row['stayDurationSum'] / total_patients if total_patients > 0 else 0
+        recovery_rate = row['recovered'] / row['discharged'] if row['discharged'] > 0 else 0
+        beds_available = BEDS_AVAILABLE.get(dept, 0)
+        total_salaries = int(row['totalSalaries'])
         
         department_data.append({
             'department': dept,
             'totalPatients': total_patients,
-            'avgStayDuration': round(avg_stay_duration, 2),
-            'totalRevenue': total_revenue,
+            'avgStayDuration': round(float(avg_stay_duration), 2),
+            'totalRevenue': int(row['totalRevenue']),
             'totalSalaries': total_salaries,
             'operatingCost': total_salaries + random.randint(50000, 200000),  # Add other costs
-            'recoveryRate': round(recovery_rate, 2),
+            'recoveryRate': round(float(recovery_rate), 2),
             'bedsAvailable': beds_available,
-            'currentlyAdmitted': currently_admitted,
-            'bedUtilization': round(bed_utilization, 2),
-            'staffCount': len(dept_staff),
-            'doctorCount': len([s for s in dept_staff if s['role'] == 'Doctor']),
-            'nurseCount': len([s for s in dept_staff if s['role'] == 'Nurse'])
+            'currentlyAdmitted': int(row['currentlyAdmitted']),
+            'bedUtilization': round(int(row['currentlyAdmitted']) / beds_available, 2) if beds_available > 0 else 0,
+            'staffCount': int(row['staffCount']),
+            'doctorCount': int(row['doctorCount']),
+            'nurseCount': int(row['nurseCount'])
         })
     
     return department_data
 
+# Generate department performance data
+def generate_department_data(patient_data, staff_data):
+    return finalize_department_data(aggregate_department_partials(patient_data, staff_data))
+
 # Generate daily metrics for time series
-def generate_daily_metrics(days=90):
+def generate_daily_metrics(days=90, now=None):
     daily_metrics = []
-    now = datetime.now()
+    now = now or datetime.now()
     
     for i in range(days):
         date = now - timedelta(days=days-i)
@@ -189,9 +331,122 @@ def generate_daily_metrics(days=90):
     
     return daily_metrics
 
+# Write records as one indented JSON array, or one JSON object per line (NDJSON)
+def write_records(records, name, output_format='json', directory='./data'):
+    path = os.path.join(directory, f'{name}.{output_format}')
+    
+    if isinstance(records, pd.DataFrame):
+        if output_format == 'ndjson':
+            records.to_json(path, orient='records', lines=True)
+        else:
+            records.to_json(path, orient='records', indent=2)
+    else:
+        with open(path, 'w') as f:
+            if output_format == 'ndjson':
+                for record in records:
+                    f.write(json.dumps(record))
+                    f.write('\n')
+            else:
+                json.dump(records, f, indent=2)
+    
+    # The dashboard prefers .ndjson files, so drop any copy left in the other format
+    other_path = os.path.join(directory, f'{name}.{"json" if output_format == "ndjson" else "ndjson"}')
+    if os.path.exists(other_path):
+        os.remove(other_path)
+
+# Split `total` rows into `n_shards` contiguous (first offset, row count) ranges.
+# Never more shards than rows, so no range is empty (a single one when `total` is 0).
+def shard_ranges(total, n_shards):
+    n_shards = max(1, min(n_shards, total))
+    sizes = [total // n_shards + (1 if k < total % n_shards else 0) for k in range(n_shards)]
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(int).tolist()
+    return list(zip(offsets, sizes))
+
+# Generate one shard of patients and staff, write it to its own files and describe it.
+# Runs in a worker process: everything it needs is passed in, nothing is shared.
+def generate_shard(shard, seed_sequence, patient_range, staff_range, now, days, output_format, directory):
+    patient_seed, staff_seed = seed_sequence.spawn(2)
+    patient_offset, n_patients = patient_range
+    staff_offset, n_staff = staff_range
+    
+    patients = generate_patient_frame(n_patients, days, seed=patient_seed, now=now, first_id=1000 + patient_offset)
+    staff = generate_staff_frame(n_staff, seed=staff_seed, first_id=1000 + staff_offset)
+    
+    patient_file = f'patients-{shard:05d}'
+    staff_file = f'staff-{shard:05d}'
+    write_records(patients, patient_file, output_format, directory)
+    write_records(staff, staff_file, output_format, directory)
+    
+    manifest_entry = {
+        'shard': shard,
+        'patients': {'file': f'{patient_file}.{output_format}', 'rows': n_patients, 'firstId': f'P{1000 + patient_offset}'},
+        'staff': {'file': f'{staff_file}.{output_format}', 'rows': n_staff, 'firstId': f'S{1000 + staff_offset}'}
+    }
+    return manifest_entry, aggregate_department_partials(patients, staff)
+
+# Generate patients and staff as independent seeded shards, one process per core.
+# Shard seeds are spawned from a single SeedSequence and all dates are relative to
+# `reference_date`, so a given (seed, n_shards, reference_date) always produces the
+# same files, whatever the number of workers or the machine.
+def generate_sharded_data(n_shards=None, n_patients=1000, n_staff=200, seed=0, reference_date=None,
+                          days=90, output_format='ndjson', directory='./data/shards', workers=None):
+    # Patients and staff are split into the same shards: no more shards than the smaller table has rows
+    n_shards = max(1, min(n_shards or os.cpu_count() or 1, n_patients, n_staff))
+    if reference_date is None:
+        reference_date = datetime.combine(datetime.now().date(), datetime.min.time())
+    
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    
+    # Drop shard files left by a previous run with a different shard count
+    for stale in glob.glob(os.path.join(directory, 'patients-*')) + glob.glob(os.path.join(directory, 'staff-*')):
+        os.remove(stale)
+    
+    seed_sequences = np.random.SeedSequence(seed).spawn(n_shards)
+    patient_ranges = shard_ranges(n_patients, n_shards)
+    staff_ranges = shard_ranges(n_staff, n_shards)
+    
+    with ProcessPoolExecutor(max_workers=workers or min(n_shards, os.cpu_count() or 1)) as executor:
+        futures = [
+            executor.submit(generate_shard, shard, seed_sequences[shard], patient_ranges[shard],
+                            staff_ranges[shard], reference_date, days, output_format, directory)
+            for shard in range(n_shards)
+        ]
+        results = [future.result() for future in futures]
+    shards = [entry for entry, _ in results]
+    
+    # Daily metrics and department KPIs are small and written once for the whole network
+    random.seed(seed)
+    daily_metrics = generate_daily_metrics(days, now=reference_date)
+    write_records(daily_metrics, 'daily_metrics', output_format, directory)
+    department_data = finalize_department_data(merge_department_partials([partials for _, partials in results]))
+    write_records(department_data, 'departments', output_format, directory)
+    
+    manifest = {
+        'seed': seed,
+        'shardCount': n_shards,
+        'referenceDate': format_date(reference_date),
+        'days': days,
+        'format': output_format,
+        'totalPatients': n_patients,
+        'totalStaff': n_staff,
+        'dailyMetrics': f'daily_metrics.{output_format}',
+        'departments': f'departments.{output_format}',
+        'shards': shards
+    }
+    with open(os.path.join(directory, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    
+    print(f'Generated {n_shards} shards ({n_patients} patients, {n_staff} staff) in {directory}')
+    return manifest
+
 # Generate all data and save to JSON files
-def generate_all_data():
-    patient_data = generate_patient_data()
+def generate_all_data(output_format='json', n_patients=1000, seed=None):
+    # Staff, daily metrics and operating costs are drawn with `random`: seed it too,
+    # so that a given seed reproduces every file
+    if seed is not None:
+        random.seed(seed)
+    patient_data = generate_patient_frame(n_patients, seed=seed)
     staff_data = generate_staff_data()
     department_data = generate_department_data(patient_data, staff_data)
     daily_metrics = generate_daily_metrics()
@@ -200,24 +455,38 @@ def generate_all_data():
     if not os.path.exists('./data'):
         os.makedirs('./data')
     
-    with open('./data/patients.json', 'w') as f:
-        json.dump(patient_data, f, indent=2)
-    
-    with open('./data/staff.json', 'w') as f:
-        json.dump(staff_data, f, indent=2)
-    
-    with open('./data/departments.json', 'w') as f:
-        json.dump(department_data, f, indent=2)
-    
-    with open('./data/daily_metrics.json', 'w') as f:
-        json.dump(daily_metrics, f, indent=2)
+    write_records(patient_data, 'patients', output_format)
+    write_records(staff_data, 'staff', output_format)
+    write_records(department_data, 'departments', output_format)
+    write_records(daily_metrics, 'daily_metrics', output_format)
     
     print('Generated fictive health structure data:')
     print(f'- {len(patient_data)} patient records')
     print(f'- {len(staff_data)} staff records')
     print(f'- {len(department_data)} department performance records')
     print(f'- {len(daily_metrics)} days of daily metrics')
-    print('Data saved to ./data/ directory')
+    print(f'Data saved to ./data/ directory ({output_format})')
 
 if __name__ == "__main__":
-    generate_all_data()
+    parser = argparse.ArgumentParser(description='Generate fictive health structure data')
+    parser.add_argument('--format', dest='output_format', choices=['json', 'ndjson'], default='json',
+                        help='json writes one indented array per file, ndjson one record per line')
+    parser.add_argument('--patients', dest='n_patients', type=int, default=1000,
+                        help='number of patient records to generate')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='random seed for reproducible data')
+    parser.add_argument('--shards', type=int, nargs='?', const=0, default=None,
+                        help='write patients and staff as seeded shards in ./data/shards (default: one per core)')
+    parser.add_argument('--staff', dest='n_staff', type=int, default=200,
+                        help='number of staff records to generate in sharded mode')
+    parser.add_argument('--reference-date', type=lambda s: datetime.strptime(s, '%Y-%m-%d'), default=None,
+                        help='date the sharded data is generated relative to (default: today)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes in sharded mode (default: one per shard, up to the core count)')
+    args = parser.parse_args()
+    
+    if args.shards is not None:
+        generate_sharded_data(args.shards or None, args.n_patients, args.n_staff, args.seed or 0,
+                              args.reference_date, output_format=args.output_format, workers=args.workers)
+    else:
+        generate_all_data(args.output_format, args.n_patients, args.seed)